@@ -26,20 +26,49 @@ Run:
 from __future__ import annotations
 
 import argparse
+import bisect
+import contextlib
 import csv
 import datetime as dt
+import functools
+import gc
+import gzip
+import heapq
+import itertools
+import json
+import multiprocessing
 import os
+import random
 import re
 import sys
+import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple, Set
+from typing import (Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple,
+                    Optional, Tuple, Set, Union)
 from urllib.parse import urljoin
 
+import io
 import requests
 import xml.etree.ElementTree as ET
 
+try:
+    from lxml import etree as LET   # optional: faster streaming XML parse
+except ImportError:
+    LET = None
+
+try:
+    import orjson                   # optional: faster JSON decode
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick              # optional: one-pass multi-CUSIP prescan
+except ImportError:
+    ahocorasick = None
+
 # ── SEC endpoints ──────────────────────────────────────────────────────────────
 SEC_DATA_BASE = "https://data.sec.gov/"
 SEC_ARCHIVES_BASE = "https://www.sec.gov/Archives/"
@@ -52,6 +81,15 @@ DEFAULT_START_FILING_DATE = "2009-01-01"
 DEFAULT_MIN_REPORT_DATE   = "2010-03-31"
 FORMS = {"13F-HR", "13F-HR/A"}
 
+# SEC fair-access policy: at most 10 requests/second per client.
+# We pace to 9/s so clock jitter never pushes us over and into 429s.
+SEC_MAX_REQUESTS_PER_SEC = 10
+SEC_TARGET_REQUESTS_PER_SEC = 9
+INDEX_FETCH_WORKERS = 8
+FILING_FETCH_WORKERS = 8
+FILING_PIPELINE_DEPTH = 4 * FILING_FETCH_WORKERS   # max filings in flight
+PARSE_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
 # ── Seed CIKs ─────────────────────────────────────────────────────────────────
 GROUPS: Dict[str, Dict[str, Any]] = {
     "BlackRock": {
@@ -105,6 +143,8 @@ README_TEXT = r"""EDGAR 13F Holdings Output — README (v22)
   panel -> per-group PANEL files: <Group>_13f_holdings_panel.csv
             plus BVS_13f_holdings_panel.csv (aggregate across all managers)
             plus ownership_pct_chart.png (graph of % shares held)
+  --format parquet writes the same tables as zstd-compressed .parquet
+  files instead of .csv (requires pyarrow).
 
 === ORDERING ===
   ticker ASC, then report_date ASC (oldest -> newest)
@@ -168,8 +208,8 @@ README_TEXT = r"""EDGAR 13F Holdings Output — README (v22)
 #  Data classes & utilities
 # ═══════════════════════════════════════════════════════════════════════════════
 
-@dataclass
-class Filing:
+class Filing(NamedTuple):
+    """Immutable, tuple-backed: no per-instance __dict__."""
     group: str
     cik: str        # 10-digit zero-padded
     cik_int: str    # integer string (no leading zeros)
@@ -180,26 +220,140 @@ class Filing:
     primary_doc: Optional[str] = None
 
 
-def pad_cik(cik: str) -> str:
-    return re.sub(r"\D", "", cik).zfill(10)
+@dataclass
+class FilingResult:
+    """Network + parse outcome for one filing (built on a fetch thread)."""
+    entry: Dict[str, str]
+    base_url: str
+    rep_str: str = ""
+    skipped: bool = False           # report_date before min_report
+    urls: List[str] = field(default_factory=list)
+    source_url: str = ""            # URL the matched holdings came from
+    via_full_submission: bool = False
+    matches: List[Tuple[str, str, Dict[str, Any]]] = field(default_factory=list)
+    total_parsed: int = 0
+    sample_cusips: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+# ── Precompiled patterns (hot paths run these once per filing / row) ──
+_RE_NON_DIGIT = re.compile(r"\D")
+_RE_DATE8 = re.compile(r"\d{8}")
+_RE_ACC = re.compile(r"^\d{10}-\d{2}-\d{6}")
+_RE_REPORTCAL = re.compile(
+    r"<reportCalendarOrQuarter>\s*(\d{4}-\d{2}-\d{2})\s*</reportCalendarOrQuarter>", re.I
+)
+_RE_CONFORMED_PERIOD = re.compile(r"CONFORMED\s+PERIOD\s+OF\s+REPORT:\s*(\d{8})", re.I)
+
+# SGML-style info table tags (parse_info_table_text)
+# A single scan over the text yields <infoTable> open/close markers and
+# every leaf tag we care about.  Values are captured without backtracking
+# and validated per field afterwards.
+_RE_IT_TOKEN = re.compile(
+    r'<(infoTable)[^>]*>'
+    r'|</(infoTable)>'
+    r'|<(cusip|value|sshPrnamt|sshPrnamtType|nameOfIssuer|titleOfClass'
+    r'|putCall|investmentDiscretion|Sole|Shared|None)>([^<]*)</\3>',
+    re.I,
+)
+_RE_IT_CUSIP_VAL = re.compile(r'[A-Za-z0-9]{8,9}')
+_RE_IT_NUM_VAL = re.compile(r'\d[\d,]*')
+_RE_IT_TYPE_VAL = re.compile(r'SH|PRN', re.I)
+
+# lower-cased tag -> (row field, validator or None for "any text")
+_IT_FIELDS = {
+    "cusip":                ("cusip", _RE_IT_CUSIP_VAL.fullmatch),
+    "value":                ("value_usd_thousands", _RE_IT_NUM_VAL.fullmatch),
+    "sshprnamt":            ("shares_held", _RE_IT_NUM_VAL.fullmatch),
+    "sshprnamttype":        ("shares_type", _RE_IT_TYPE_VAL.fullmatch),
+    "nameofissuer":         ("issuer_name", bool),
+    "titleofclass":         ("class_title", bool),
+    "putcall":              ("put_call", None),
+    "investmentdiscretion": ("investment_discretion", None),
+    "sole":                 ("voting_sole", _RE_IT_NUM_VAL.fullmatch),
+    "shared":               ("voting_shared", _RE_IT_NUM_VAL.fullmatch),
+    "none":                 ("voting_none", _RE_IT_NUM_VAL.fullmatch),
+}
 
-def cik_int_str(cik: str) -> str:
-    return str(int(re.sub(r"\D", "", cik)))
+# Tabular fallback: CUSIP (8 or 9 chars) followed by value, shares, SH/PRN.
+# Domestic CUSIPs start with digits (e.g. 037833100 for AAPL) while
+# international CINs start with letters (e.g. G1151C101); match both.
+# The pattern opens with a plain character class (no ``^|`` alternative) so
+# the regex engine can skip ahead to separator characters instead of trying
+# every offset; callers prepend "\n" so a CUSIP at the very start still has
+# a separator in front of it.
+#
+# `[\d,]*` runs can end at any comma, so a long run of digits and commas
+# with no SH/PRN after it made _RE_IT_LINE try every split before failing.
+# This lookahead (a condition every match already meets) rejects such a
+# CUSIP in one linear scan.  Its possessive runs need Python 3.11+; older
+# interpreters just go without it.
+_IT_LINE_GUARD = r'(?=[\s|,;]++\d[\d\s|,;]*+(?:SH|PRN))'
+try:
+    re.compile(_IT_LINE_GUARD)
+except re.error:
+    _IT_LINE_GUARD = ""
+
+_RE_IT_LINE = re.compile(
+    r'[\s|,;>]'                        # preceded by separator or tag close
+    r'([A-Z0-9][A-Z0-9]{5}\d{2,3})'   # CUSIP (8 or 9 chars, any alnum start)
+    + _IT_LINE_GUARD +
+    r'[\s|,;]+'
+    r'(\d[\d,]*)'                      # value ($1000s)
+    r'[\s|,;]+'
+    r'(\d[\d,]*)'                      # shares
+    r'[\s|,;]+'
+    r'(SH|PRN)',                        # type
+    re.I,
+)
+
+# Full submission .txt documents
+# (bytes patterns: the SGML markers are ASCII, so blocks are split out of the
+# raw submission without decoding it)
+_RE_XML_DECL = re.compile(rb'<\?xml[^>]*\?>')
+_RE_DOCUMENT = re.compile(rb'<DOCUMENT>(.*?)</DOCUMENT>', re.DOTALL | re.IGNORECASE)
+_RE_DOC_TEXT = re.compile(rb'<TEXT>(.*?)(?:</TEXT>|$)', re.DOTALL | re.IGNORECASE)
+
+
+def pad_cik(cik: Any) -> str:
+    if isinstance(cik, int):
+        return str(cik).zfill(10)
+    if cik.isdigit():        # common case: already bare digits
+        return cik.zfill(10)
+    return _RE_NON_DIGIT.sub("", cik).zfill(10)
+
+def cik_int_str(cik: Any) -> str:
+    if isinstance(cik, int):
+        return str(cik)
+    if cik.isdigit():
+        return str(int(cik))
+    return str(int(_RE_NON_DIGIT.sub("", cik)))
 
 def accession_nodash(acc: str) -> str:
     return acc.replace("-", "")
 
+# Pure functions of a handful of distinct date strings, called per row;
+# typed=True keeps e.g. 20100331 and 20100331.0 apart.
+@functools.lru_cache(maxsize=16384, typed=True)
 def parse_date(s: Any) -> Optional[dt.date]:
     if s is None:
         return None
-    x = str(s).strip()
+    x = s if isinstance(s, str) else str(s)
+    n = len(x)
+    # Fast paths: 'YYYY-MM-DD' and 'YYYYMMDD' (nearly every call); no
+    # regex, no strip
+    try:
+        if n == 10 and x[4] == "-":
+            return dt.date.fromisoformat(x)
+        if n == 8 and x.isdigit():
+            return dt.date(int(x[:4]), int(x[4:6]), int(x[6:8]))
+    except ValueError:
+        return None
+    x = x.strip()
     if not x:
         return None
-    if re.fullmatch(r"\d{8}", x):
-        try:
-            return dt.date(int(x[:4]), int(x[4:6]), int(x[6:8]))
-        except Exception:
-            return None
+    if len(x) != n:
+        return parse_date(x)
     try:
         return dt.date.fromisoformat(x)
     except Exception:
@@ -210,9 +364,15 @@ def date_str(s: Any) -> str:
     return d.isoformat() if d else ""
 
 def safe_int(s: Any) -> int:
-    if s is None:
+    if not s:
         return 0
-    if isinstance(s, (int, float)):
+    if type(s) is str:
+        # Plain integer strings ("12345") are the norm in 13F rows.
+        try:
+            return int(s)
+        except ValueError:
+            pass
+    elif isinstance(s, (int, float)):
         return int(s)
     x = str(s).strip().replace(",", "")
     if not x:
@@ -222,28 +382,94 @@ def safe_int(s: Any) -> int:
     except Exception:
         return 0
 
+@functools.lru_cache(maxsize=16384, typed=True)
 def _sort_date(s: Any) -> dt.date:
     return parse_date(s) or dt.date(9999, 12, 31)
 
 
+@functools.lru_cache(maxsize=16384, typed=True)
+def _sort_iso(s: Any) -> str:
+    # Fixed-width ISO text of _sort_date(s): orders exactly like the date,
+    # so it can be packed into a single string sort key.
+    return _sort_date(s).isoformat()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  SEC HTTP
 # ═══════════════════════════════════════════════════════════════════════════════
 
+class TokenBucket:
+    """Thread-safe token bucket: allows at most `rate` acquisitions per
+    second, with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Shared by every thread that talks to SEC.  Capacity 1 spaces requests
+# evenly: a larger bucket would let the worker pools burst its contents on
+# top of the refill after any pause and exceed 10 requests in one second.
+_SEC_LIMITER = TokenBucket(SEC_TARGET_REQUESTS_PER_SEC, capacity=1)
+
+
+def build_session(user_agent: str) -> requests.Session:
+    """One keep-alive session for the whole run.  The per-host connection
+    pool is sized for the worker pools so threads reuse sockets instead of
+    opening (and TLS-handshaking) new ones."""
+    session = requests.Session()
+    pool = max(INDEX_FETCH_WORKERS, FILING_FETCH_WORKERS) + 2
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": user_agent,
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    })
+    return session
+
+
 def sec_get(session: requests.Session, url: str, retries: int = 12,
-            timeout: int = 90) -> requests.Response:
+            timeout: int = 90,
+            headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    """GET with retry/backoff.  A 304 is returned as-is so callers sending
+    conditional headers can fall back to their cached copy."""
     backoff = 1.0
     for attempt in range(retries):
+        _SEC_LIMITER.acquire()
         try:
-            r = session.get(url, timeout=timeout)
+            r = session.get(url, timeout=timeout, headers=headers)
         except requests.exceptions.RequestException:
             time.sleep(backoff)
             backoff = min(backoff * 2.0, 90.0)
             continue
-        if r.status_code == 200:
+        if r.status_code in (200, 304):
             return r
-        if r.status_code in (429, 500, 502, 503, 504):
-            time.sleep(backoff)
+        # SEC's rate limiter answers 403 "Request Rate Threshold Exceeded"
+        # as well as 429; both clear after a pause.
+        if r.status_code in (429, 500, 502, 503, 504) or (
+                r.status_code == 403 and "Request Rate Threshold" in r.text):
+            # Honour Retry-After; otherwise jitter the backoff so the worker
+            # threads don't all retry in lockstep.
+            ra = (r.headers.get("Retry-After") or "").strip()
+            time.sleep(float(ra) if ra.isdigit() else backoff * random.uniform(0.5, 1.5))
             backoff = min(backoff * 2.0, 90.0)
             continue
         if r.status_code == 404:
@@ -252,6 +478,82 @@ def sec_get(session: requests.Session, url: str, retries: int = 12,
     raise RuntimeError(f"GET {url} failed after {retries} retries")
 
 
+def iter_bounded(pool: Any, fn: Callable[[Any], Any], items: Iterable[Any],
+                 window: int):
+    """Like pool.map, but keeps at most `window` calls submitted ahead of
+    the consumer, so a slow consumer can't pile up unbounded results.
+    Yields results in input order; exceptions surface when reached."""
+    it = iter(items)
+    pending = deque(pool.submit(fn, x) for x in itertools.islice(it, window))
+    while pending:
+        fut = pending.popleft()
+        for x in itertools.islice(it, 1):
+            pending.append(pool.submit(fn, x))
+        yield fut.result()
+
+
+def _json(resp: requests.Response) -> Any:
+    """Decode a JSON response body, via orjson straight from bytes when
+    available (skips requests' text decode)."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
+def _json_bytes(raw: bytes) -> Any:
+    """Decode a JSON document held as bytes (e.g. from archive_get)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# Root of the on-disk copy of filing documents (see archive_get); None
+# leaves them uncached.  Set from --cache-filings.
+_ARCHIVE_CACHE_DIR: Optional[str] = None
+
+
+def set_archive_cache_dir(cache_dir: Optional[str]) -> None:
+    global _ARCHIVE_CACHE_DIR
+    _ARCHIVE_CACHE_DIR = cache_dir
+
+
+def _archive_cache_path(url: str) -> Optional[str]:
+    """Cache file for a document under edgar/data/, or None when caching
+    is off or the URL is anything else."""
+    if _ARCHIVE_CACHE_DIR is None:
+        return None
+    head, sep, rel = url.partition("/edgar/data/")
+    if not sep or not url.startswith(SEC_ARCHIVES_BASE):
+        return None
+    parts = rel.split("/")
+    if any(p in ("", ".", "..") for p in parts):
+        return None
+    return os.path.join(_ARCHIVE_CACHE_DIR, "archives", *parts) + ".gz"
+
+
+def archive_get(session: requests.Session, url: str,
+                timeout: int = 90) -> bytes:
+    """Body of a filing document (index.json, primary doc, info table,
+    full submission).  Accepted filings never change, so with a cache
+    directory set a stored copy is used without revalidation; misses are
+    fetched with sec_get and stored gzip-compressed."""
+    path = _archive_cache_path(url)
+    if path is not None:
+        try:
+            with gzip.open(path, "rb") as f:
+                return f.read()
+        except (OSError, EOFError):
+            pass    # not cached yet (or a truncated copy): fetch again
+    raw = sec_get(session, url, timeout=timeout).content
+    if path is not None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wb", compresslevel=3) as f:
+            f.write(raw)
+        os.replace(tmp, path)
+    return raw
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  Quarterly full-index filing discovery  (v22 — replaces submissions API)
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -283,11 +585,11 @@ def _accession_from_filename(filename: str) -> str:
     nodash = base.split(".")[0]           # e.g. '0001364742-10-000123'
 
     # If already contains dashes in the right pattern, use as-is
-    if re.match(r"^\d{10}-\d{2}-\d{6}", nodash):
+    if _RE_ACC.match(nodash):
         return nodash[:20]  # CIK(10) + dash + YY(2) + dash + SEQ(6) = 20 chars
 
     # Otherwise, try undashed format (18+ digits)
-    digits_only = re.sub(r"\D", "", nodash)
+    digits_only = _RE_NON_DIGIT.sub("", nodash)
     if len(digits_only) >= 18:
         return f"{digits_only[:10]}-{digits_only[10:12]}-{digits_only[12:18]}"
 
@@ -306,84 +608,147 @@ def _cik_int_from_filename(filename: str) -> str:
     return ""
 
 
-def parse_index_text(text: str, target_ciks: Set[str],
+def _quarter_end(year: int, qtr: int) -> dt.date:
+    if qtr == 4:
+        return dt.date(year, 12, 31)
+    return dt.date(year, 3 * qtr + 1, 1) - dt.timedelta(days=1)
+
+
+# A quarter's master.idx stops changing once late filings have settled;
+# anything that ended longer ago than this is served from cache unchecked.
+INDEX_IMMUTABLE_AFTER_DAYS = 120
+
+
+def _cached_index(session: requests.Session, year: int, qtr: int,
+                  cache_dir: str) -> Tuple[bytes, Optional[requests.Response]]:
+    """Return master.idx bytes for (year, qtr), using an on-disk gzip cache.
+
+    Historical quarters are read straight from cache.  Recent ones are
+    revalidated with If-None-Match / If-Modified-Since; a 304 reuses the
+    cached copy.  The response is None when nothing was downloaded.
+    """
+    gz_path = os.path.join(cache_dir, f"master_{year}Q{qtr}.idx.gz")
+    meta_path = gz_path[:-3] + ".meta.json"
+    have_cache = os.path.exists(gz_path)
+
+    def read_cache() -> bytes:
+        with gzip.open(gz_path, "rb") as f:
+            return f.read()
+
+    immutable = (dt.date.today() - _quarter_end(year, qtr)).days > INDEX_IMMUTABLE_AFTER_DAYS
+    if have_cache and immutable:
+        return read_cache(), None
+
+    headers: Dict[str, str] = {}
+    if have_cache and os.path.exists(meta_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    url = SEC_FULL_INDEX.format(year=year, qtr=qtr)
+    resp = sec_get(session, url, timeout=120, headers=headers or None)
+    if resp.status_code == 304 and have_cache:
+        return read_cache(), resp
+
+    raw = resp.content
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = gz_path + ".tmp"
+    with gzip.open(tmp, "wb", compresslevel=3) as f:
+        f.write(raw)
+    os.replace(tmp, gz_path)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"etag": resp.headers.get("ETag", ""),
+                   "last_modified": resp.headers.get("Last-Modified", "")}, f)
+    return raw, resp
+
+
+def parse_index_text(text: Union[str, bytes], target_ciks: Set[str],
                      target_forms: Set[str],
-                     verbose: bool = False) -> List[Dict[str, str]]:
+                     verbose: bool = False,
+                     target_cik_ints: Optional[FrozenSet[int]] = None,
+                     ) -> List[Dict[str, str]]:
     """Parse a master.idx file (pipe-delimited), returning rows matching
-    target CIKs and forms.
+    target CIKs and forms.  Callers parsing many files can pass
+    `target_cik_ints` (the CIKs as ints) precomputed.
+
+    `text` may be the raw downloaded bytes: the index is ASCII, so lines
+    are split and filtered as bytes and only matching rows are decoded.
 
     master.idx format:
       CIK|Company Name|Form Type|Date Filed|Filename
     with a few header/separator lines at the top.
     """
-    lines = text.split("\n")
+    if isinstance(text, bytes):
+        nl, pipe, dash = b"\n", b"|", b"-"
+        hdr_cik, hdr_form = b"CIK", b"Form Type"
+        forms = {f.encode("ascii") for f in target_forms}
+        def dec(x): return x.decode("utf-8", errors="replace")
+    else:
+        nl, pipe, dash = "\n", "|", "-"
+        hdr_cik, hdr_form = "CIK", "Form Type"
+        forms = target_forms
+        def dec(x): return x
+
+    lines = text.split(nl)
     results: List[Dict[str, str]] = []
-    header_found = False
-    data_started = False
 
-    for line in lines:
+    # Locate where data begins: just after the header row, or at the
+    # first pipe-delimited line that starts with a CIK if there is none.
+    start = None
+    for idx, line in enumerate(lines):
         stripped = line.strip()
-        if not stripped:
+        if not stripped or stripped.startswith(dash):
             continue
-
-        # Look for header row
-        if not header_found:
-            if "|" in stripped and ("CIK" in stripped or "Form Type" in stripped):
-                header_found = True
-                continue  # skip the header itself
-            # Skip separator lines
-            if stripped.startswith("-"):
-                continue
-            # Fallback: if line has 4+ pipes and starts with digits, treat as data
-            if stripped.count("|") >= 4 and stripped.split("|")[0].strip().isdigit():
-                header_found = True  # implicit header
-                data_started = True
-                # Don't continue — fall through to parse this line
-            else:
-                continue
-
-        # Skip separator lines after header
-        if stripped.startswith("-"):
-            data_started = True
-            continue
-
-        data_started = True
-
-        # Parse pipe-delimited data
-        parts = stripped.split("|")
+        if pipe in stripped and (hdr_cik in stripped or hdr_form in stripped):
+            start = idx + 1
+            break
+        if stripped.count(pipe) >= 4 and stripped.split(pipe)[0].strip().isdigit():
+            start = idx
+            break
+
+    if start is None:
+        if verbose:
+            print("      WARNING: could not find header line in index file", flush=True)
+        return results
+
+    # Hot loop: most lines are other forms, so reject on form type before
+    # any other work.  CIKs are compared as ints to skip zero-padding.
+    if target_cik_ints is None:
+        target_cik_ints = frozenset(int(c) for c in target_ciks)
+    want_form = forms.__contains__
+    want_cik = target_cik_ints.__contains__
+    append = results.append
+    for line in lines[start:]:
+        parts = line.split(pipe)
         if len(parts) < 5:
             continue
-
-        cik_raw    = parts[0].strip()
-        # company  = parts[1].strip()  # not needed
-        form_type  = parts[2].strip()
-        date_filed = parts[3].strip()
-        filename   = parts[4].strip()
-
-        # Filter by form type
-        if form_type not in target_forms:
+        form_type = parts[2].strip()
+        if not want_form(form_type):
+            continue
+        cik_raw = parts[0].strip()
+        if cik_raw.startswith(dash):
             continue
-
-        # Normalize CIK to 10-digit padded
         try:
-            cik_padded = str(int(cik_raw)).zfill(10)
-        except (ValueError, TypeError):
+            cik_num = int(cik_raw)
+        except ValueError:
             continue
-
-        # Filter by target CIKs
-        if cik_padded not in target_ciks:
+        if not want_cik(cik_num):
             continue
 
-        results.append({
-            "cik": cik_padded,
-            "form": form_type,
-            "filing_date": date_filed,
-            "filename": filename,
+        append({
+            "cik": pad_cik(cik_num),
+            "cik_num": cik_num,
+            "form": dec(form_type),
+            "filing_date": dec(parts[3].strip()),
+            "filename": dec(parts[4].strip()),
         })
 
-    if verbose and not header_found:
-        print("      WARNING: could not find header line in index file", flush=True)
-
     return results
 
 
@@ -392,10 +757,14 @@ def discover_filings_via_full_index(
     all_ciks: Set[str],
     start_filing: dt.date,
     verbose: bool = False,
+    cache_dir: Optional[str] = None,
 ) -> List[Dict[str, str]]:
     """Download quarterly master.idx files and extract all 13F filings for our CIKs.
 
-    Returns a list of dicts: {cik, form, filing_date, filename, accession, cik_int}
+    With cache_dir set, index files are kept on disk (see _cached_index).
+
+    Returns a list of dicts: {cik, cik_num, form, filing_date, filename,
+    accession, cik_int}; cik_num is the CIK as an int.
     """
     today = dt.date.today()
     # Scan through Q1 of the current year to catch Q4-previous-year
@@ -412,95 +781,110 @@ def discover_filings_via_full_index(
         print(f"  Target CIKs: {sorted(all_ciks)}", flush=True)
         print(f"  URL template: {SEC_FULL_INDEX}", flush=True)
 
-    all_entries: List[Dict[str, str]] = []
-    diag_done = False
-
-    for i, (year, qtr) in enumerate(quarters, 1):
-        url = SEC_FULL_INDEX.format(year=year, qtr=qtr)
+    def fetch_quarter(yq: Tuple[int, int]):
+        url = SEC_FULL_INDEX.format(year=yq[0], qtr=yq[1])
         try:
-            resp = sec_get(session, url, timeout=120)
-        except FileNotFoundError:
-            if verbose:
-                print(f"  [{i}/{len(quarters)}] Q{qtr}-{year}: not found (404), skipping", flush=True)
-            time.sleep(0.15)
-            continue
+            if cache_dir:
+                raw, resp = _cached_index(session, yq[0], yq[1], cache_dir)
+            else:
+                resp = sec_get(session, url, timeout=120)
+                raw = resp.content
+            return url, raw, resp, None
         except Exception as e:
-            if verbose:
-                print(f"  [{i}/{len(quarters)}] Q{qtr}-{year}: ERROR {e}", flush=True)
-            time.sleep(0.15)
-            continue
+            return url, None, None, e
 
-        # ── Decode response robustly ──
-        # master.idx is plain text but SEC often serves it without charset header,
-        # causing requests to default to ISO-8859-1.  Try multiple decodings.
-        text = None
-        raw = resp.content
-        for enc in ("utf-8", "latin-1", "ascii"):
-            try:
-                text = raw.decode(enc, errors="replace")
-                if "|" in text[:5000]:
-                    break  # looks like valid pipe-delimited data
-            except Exception:
+    all_entries: List[Dict[str, str]] = []
+    diag_done = False
+    target_cik_ints = frozenset(int(c) for c in all_ciks)
+
+    # Downloads run concurrently (paced by sec_get's token bucket); results
+    # are consumed in quarter order and parsed on this thread.
+    with ThreadPoolExecutor(max_workers=INDEX_FETCH_WORKERS) as pool:
+        fetched = pool.map(fetch_quarter, quarters)
+        for i, ((year, qtr), (url, raw, resp, err)) in enumerate(zip(quarters, fetched), 1):
+            if isinstance(err, FileNotFoundError):
+                if verbose:
+                    print(f"  [{i}/{len(quarters)}] Q{qtr}-{year}: not found (404), skipping", flush=True)
+                continue
+            if err is not None:
+                if verbose:
+                    print(f"  [{i}/{len(quarters)}] Q{qtr}-{year}: ERROR {err}", flush=True)
                 continue
-        if text is None:
-            text = resp.text  # fallback to requests' auto-detection
-
-        # ── Diagnostic output (first successful download) ──
-        if verbose and not diag_done:
-            diag_done = True
-            print(f"\n  [DIAG] === First index file: Q{qtr}-{year} ===", flush=True)
-            print(f"  [DIAG] URL: {url}", flush=True)
-            print(f"  [DIAG] HTTP status: {resp.status_code}", flush=True)
-            print(f"  [DIAG] Content-Type: {resp.headers.get('Content-Type', '?')}", flush=True)
-            print(f"  [DIAG] Content length: {len(raw)} bytes", flush=True)
-            print(f"  [DIAG] Encoding used: {resp.encoding} -> detected pipes: {'|' in text[:5000]}", flush=True)
-
-            # Check if response looks like HTML (redirect/error page)
-            text_start = text.lstrip()[:200]
-            if text_start.startswith("<") or text_start.startswith("<!"):
-                print(f"  [DIAG] ⚠️  Response appears to be HTML, not a text index!", flush=True)
-                print(f"  [DIAG] First 300 chars: {text[:300]}", flush=True)
-            else:
-                sample_lines = text.split("\n")[:15]
-                print(f"  [DIAG] First {len(sample_lines)} lines:", flush=True)
-                for sl in sample_lines:
-                    print(f"    | {sl[:130]}", flush=True)
-
-                # Count total lines and pipe-delimited lines
-                all_lines = text.split("\n")
-                pipe_lines = [l for l in all_lines if l.count("|") >= 4]
-                print(f"  [DIAG] Total lines: {len(all_lines)}, "
-                      f"pipe-delimited data lines: {len(pipe_lines)}", flush=True)
-
-                # Try to find our CIKs in raw text as sanity check
-                for cik in sorted(all_ciks)[:3]:  # check first 3
-                    cik_raw = str(int(cik))  # remove leading zeros
-                    count = text.count(f"|{cik_raw}|") + text.count(f"{cik_raw}|")
-                    if count > 0:
-                        print(f"  [DIAG] CIK {cik} (raw: {cik_raw}) appears ~{count} time(s) in file", flush=True)
-                    else:
-                        print(f"  [DIAG] CIK {cik} (raw: {cik_raw}) NOT found in file", flush=True)
 
-            print(f"  [DIAG] ================================\n", flush=True)
+            # ── Diagnostic output (first successful download) ──
+            # The index itself is parsed as bytes; only the diagnostics
+            # need decoded text.
+            if verbose and not diag_done:
+                diag_done = True
+                # master.idx is plain text but SEC often serves it without charset header,
+                # causing requests to default to ISO-8859-1.  Try multiple decodings.
+                text = None
+                for enc in ("utf-8", "latin-1", "ascii"):
+                    try:
+                        text = raw.decode(enc, errors="replace")
+                        if "|" in text[:5000]:
+                            break  # looks like valid pipe-delimited data
+                    except Exception:
+                        continue
+                if text is None:
+                    text = raw.decode("latin-1")
+
+                print(f"\n  [DIAG] === First index file: Q{qtr}-{year} ===", flush=True)
+                print(f"  [DIAG] URL: {url}", flush=True)
+                if resp is None:
+                    print(f"  [DIAG] Served from cache: {cache_dir}", flush=True)
+                else:
+                    print(f"  [DIAG] HTTP status: {resp.status_code}", flush=True)
+                    print(f"  [DIAG] Content-Type: {resp.headers.get('Content-Type', '?')}", flush=True)
+                print(f"  [DIAG] Content length: {len(raw)} bytes", flush=True)
+                print(f"  [DIAG] Encoding used: {resp.encoding if resp is not None else None} "
+                      f"-> detected pipes: {'|' in text[:5000]}", flush=True)
+
+                # Check if response looks like HTML (redirect/error page)
+                text_start = text.lstrip()[:200]
+                if text_start.startswith("<") or text_start.startswith("<!"):
+                    print(f"  [DIAG] ⚠️  Response appears to be HTML, not a text index!", flush=True)
+                    print(f"  [DIAG] First 300 chars: {text[:300]}", flush=True)
+                else:
+                    sample_lines = text.split("\n")[:15]
+                    print(f"  [DIAG] First {len(sample_lines)} lines:", flush=True)
+                    for sl in sample_lines:
+                        print(f"    | {sl[:130]}", flush=True)
+
+                    # Count total lines and pipe-delimited lines
+                    all_lines = text.split("\n")
+                    pipe_lines = [l for l in all_lines if l.count("|") >= 4]
+                    print(f"  [DIAG] Total lines: {len(all_lines)}, "
+                          f"pipe-delimited data lines: {len(pipe_lines)}", flush=True)
+
+                    # Try to find our CIKs in raw text as sanity check
+                    for cik in sorted(all_ciks)[:3]:  # check first 3
+                        cik_raw = str(int(cik))  # remove leading zeros
+                        count = text.count(f"|{cik_raw}|") + text.count(f"{cik_raw}|")
+                        if count > 0:
+                            print(f"  [DIAG] CIK {cik} (raw: {cik_raw}) appears ~{count} time(s) in file", flush=True)
+                        else:
+                            print(f"  [DIAG] CIK {cik} (raw: {cik_raw}) NOT found in file", flush=True)
 
-        entries = parse_index_text(text, all_ciks, FORMS, verbose=verbose)
+                print(f"  [DIAG] ================================\n", flush=True)
 
-        # Enrich each entry with derived fields
-        for e in entries:
-            e["accession"] = _accession_from_filename(e["filename"])
-            e["cik_int"] = _cik_int_from_filename(e["filename"]) or cik_int_str(e["cik"])
+            entries = parse_index_text(raw, all_ciks, FORMS, verbose=verbose,
+                                       target_cik_ints=target_cik_ints)
 
-        # Filter by start_filing date
-        entries = [e for e in entries
-                   if (parse_date(e["filing_date"]) or dt.date.min) >= start_filing]
+            # Enrich each entry with derived fields
+            for e in entries:
+                e["accession"] = _accession_from_filename(e["filename"])
+                e["cik_int"] = _cik_int_from_filename(e["filename"]) or cik_int_str(e["cik_num"])
 
-        all_entries.extend(entries)
+            # Filter by start_filing date
+            entries = [e for e in entries
+                       if (parse_date(e["filing_date"]) or dt.date.min) >= start_filing]
 
-        if verbose:
-            print(f"  [{i}/{len(quarters)}] Q{qtr}-{year}: "
-                  f"{len(entries)} 13F filing(s) matched", flush=True)
+            all_entries.extend(entries)
 
-        time.sleep(0.15)
+            if verbose:
+                print(f"  [{i}/{len(quarters)}] Q{qtr}-{year}: "
+                      f"{len(entries)} 13F filing(s) matched", flush=True)
 
     if verbose:
         print(f"  Total 13F filings discovered: {len(all_entries)}", flush=True)
@@ -518,7 +902,7 @@ def _submissions_has_13f(session: requests.Session, cik: str, start: dt.date) ->
     """
     try:
         url = urljoin(SEC_DATA_BASE, f"submissions/CIK{pad_cik(cik)}.json")
-        sub = sec_get(session, url).json()
+        sub = _json(sec_get(session, url))
         recent = sub.get("filings", {}).get("recent", {})
         forms = recent.get("form", [])
         dates = recent.get("filingDate", [])
@@ -532,18 +916,57 @@ def _submissions_has_13f(session: requests.Session, cik: str, start: dt.date) ->
         return False
 
 
+def verify_candidate_ciks(session: requests.Session,
+                          cands: List[Dict[str, Any]],
+                          seed_ciks: Iterable[str],
+                          start: dt.date,
+                          verbose: bool = True) -> Set[str]:
+    """Seed CIKs plus every candidate company (company_tickers entries)
+    with a 13F filing since `start`.
+
+    The submissions lookups run concurrently on INDEX_FETCH_WORKERS
+    threads (paced by sec_get's token bucket), one per distinct CIK;
+    results are consumed in candidate order for the progress lines.
+    """
+    verified: Set[str] = set(seed_ciks)
+    cps = []
+    for c in cands:
+        cik = str(c.get("cik_str") or "").strip()
+        cps.append(pad_cik(cik) if cik else "")
+    with ThreadPoolExecutor(max_workers=INDEX_FETCH_WORKERS) as pool:
+        checks = {cp: pool.submit(_submissions_has_13f, session, cp, start)
+                  for cp in dict.fromkeys(cps) if cp and cp not in verified}
+        for i, cp in enumerate(cps, 1):
+            if not cp or cp in verified:
+                continue
+            if checks[cp].result():
+                verified.add(cp)
+            if verbose and (i % 50 == 0 or i == len(cands)):
+                print(f"    scanned {i}/{len(cands)}, "
+                      f"verified={len(verified)}", flush=True)
+    return verified
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  Info table discovery + parsing
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def _filing_base_url(cik_int: str, accession: str) -> str:
-    return urljoin(SEC_ARCHIVES_BASE,
-                   f"edgar/data/{cik_int}/{accession_nodash(accession)}/")
+    """Filing directory URL, always with a trailing slash, so document
+    URLs are plain `base_url + name`."""
+    return (f"{SEC_ARCHIVES_BASE}edgar/data/{cik_int}/"
+            f"{accession_nodash(accession)}/")
 
 
 def extract_report_date(session: requests.Session, base_url: str,
-                        primary_doc: Optional[str] = None) -> str:
-    """Try to extract reportCalendarOrQuarter from the filing's primary doc."""
+                        primary_doc: Optional[str] = None,
+                        available: Optional[Set[str]] = None) -> str:
+    """Try to extract reportCalendarOrQuarter from the filing's primary doc.
+
+    `available` is the filing's directory listing (file names from
+    index.json) when already known; candidates not in it are skipped
+    rather than requested just to 404 (pre-2013 filings have no XML
+    primary doc at all)."""
     candidates = []
     if primary_doc:
         candidates.append(primary_doc)
@@ -551,16 +974,15 @@ def extract_report_date(session: requests.Session, base_url: str,
     for name in dict.fromkeys(candidates):
         if not name:
             continue
+        if available is not None and name not in available:
+            continue
         try:
-            text = sec_get(session, urljoin(base_url, name),
-                           timeout=45).content.decode("utf-8", errors="ignore")
-            m = re.search(
-                r"<reportCalendarOrQuarter>\s*(\d{4}-\d{2}-\d{2})\s*</reportCalendarOrQuarter>",
-                text, re.I,
-            )
+            text = archive_get(session, base_url + name,
+                               timeout=45).decode("utf-8", errors="ignore")
+            m = _RE_REPORTCAL.search(text)
             if m:
                 return m.group(1)
-            m = re.search(r"CONFORMED\s+PERIOD\s+OF\s+REPORT:\s*(\d{8})", text, re.I)
+            m = _RE_CONFORMED_PERIOD.search(text)
             if m:
                 d = parse_date(m.group(1))
                 if d:
@@ -570,6 +992,7 @@ def extract_report_date(session: requests.Session, base_url: str,
     return ""
 
 
+@functools.lru_cache(maxsize=4096)
 def guess_report_date(filing_date_str: str) -> str:
     """Heuristic: guess which quarter a 13F filing covers based on filing date.
 
@@ -595,15 +1018,30 @@ def guess_report_date(filing_date_str: str) -> str:
         return f"{y}-09-30"
 
 
+@functools.lru_cache(maxsize=256)
+def _filing_index_items(session: requests.Session,
+                        base_url: str) -> Tuple[Dict[str, Any], ...]:
+    """Directory items from a filing's index.json.  Cached because both the
+    info-table search and the full-submission fallback need them; treat
+    the returned dicts as read-only."""
+    idx = _json_bytes(archive_get(session, base_url + "index.json"))
+    return tuple(idx.get("directory", {}).get("item", []) or [])
+
+
 def find_info_table_urls(session: requests.Session, base_url: str,
                          primary_doc: Optional[str] = None) -> List[str]:
-    """Find candidate info-table XML URLs from a filing's index.json."""
+    """Find candidate info-table XML URLs from a filing's index.json.
+
+    When the filing has an XML document named like an information table
+    (the norm since 2013), only those are returned: each candidate costs
+    a request, and the other documents never hold the holdings.
+    """
     try:
-        idx = sec_get(session, urljoin(base_url, "index.json")).json()
+        items = _filing_index_items(session, base_url)
     except Exception:
         return []
-    items = idx.get("directory", {}).get("item", []) or []
     candidates = []
+    obvious = []
     for it in items:
         name = it.get("name") or ""
         ln = name.lower()
@@ -623,18 +1061,206 @@ def find_info_table_urls(session: requests.Session, base_url: str,
         score += min(size // 5000, 40)
         if "primary" in ln or name == (primary_doc or ""):
             score -= 50
+        elif ln.endswith(".xml") and ("infotable" in ln or "informationtable" in ln):
+            obvious.append((score, name))
         candidates.append((score, name))
-    candidates.sort(key=lambda x: (-x[0], x[1]))
-    return [urljoin(base_url, n) for (_, n) in candidates[:25]]
+    best = heapq.nsmallest(25, obvious or candidates,
+                           key=lambda x: (-x[0], x[1]))
+    return [base_url + n for (_, n) in best]
 
 
 def _strip_ns(tag: str) -> str:
     return tag.split("}", 1)[-1] if "}" in tag else tag
 
 
-def parse_info_table_xml(xml_bytes: bytes) -> List[Dict[str, Any]]:
+# Children where a repeated tag keeps the last occurrence rather than the first.
+_LAST_CHILD_WINS = frozenset(("shrsorprnamt", "votingauthority"))
+
+
+def _child_map(parent) -> Dict[str, Any]:
+    """Map lower-cased local tag -> child element, in one pass over `parent`.
+    The first child with a given tag wins, except for _LAST_CHILD_WINS."""
+    out: Dict[str, Any] = {}
+    for ch in parent:
+        tag = ch.tag
+        if not isinstance(tag, str):
+            continue
+        key = _strip_ns(tag).lower()
+        if key not in out or key in _LAST_CHILD_WINS:
+            out[key] = ch
+    return out
+
+
+def _descendant_map(parent) -> Dict[str, Any]:
+    """Like _child_map, but over every element below `parent`; the first
+    one in document order wins."""
+    out: Dict[str, Any] = {}
+    for d in parent.iter():
+        tag = d.tag
+        if d is parent or not isinstance(tag, str):
+            continue
+        out.setdefault(_strip_ns(tag).lower(), d)
+    return out
+
+
+def _ct(kids: Dict[str, Any], name: str) -> str:
+    """Stripped text of the child `name` (lower-case) from a _child_map."""
+    ch = kids.get(name)
+    return (ch.text or "").strip() if ch is not None else ""
+
+
+# Row field -> lower-cased leaf tag under <infoTable>.
+_INFO_TABLE_LEAVES = (
+    ("issuer_name", "nameofissuer"), ("class_title", "titleofclass"),
+    ("cusip", "cusip"), ("value_usd_thousands", "value"),
+    ("put_call", "putcall"), ("investment_discretion", "investmentdiscretion"),
+    ("other_manager", "othermanager"),
+    ("shares_held", "sshprnamt"), ("shares_type", "sshprnamttype"),
+    ("voting_sole", "sole"), ("voting_shared", "shared"), ("voting_none", "none"),
+)
+
+
+def _info_table_row(el, kids: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build a holding row from an <infoTable> element (ElementTree or lxml)."""
+    if kids is None:
+        kids = _child_map(el)
+    row = {
+        "issuer_name": _ct(kids, "nameofissuer"),
+        "class_title": _ct(kids, "titleofclass"),
+        "cusip": _ct(kids, "cusip"),
+        "value_usd_thousands": _ct(kids, "value"),
+        "put_call": _ct(kids, "putcall"),
+        "investment_discretion": _ct(kids, "investmentdiscretion"),
+        "other_manager": _ct(kids, "othermanager"),
+        "shares_held": "", "shares_type": "",
+        "voting_sole": "", "voting_shared": "", "voting_none": "",
+    }
+    shrs = kids.get("shrsorprnamt")
+    if shrs is not None:
+        sub = _child_map(shrs)
+        row["shares_held"] = _ct(sub, "sshprnamt")
+        row["shares_type"] = _ct(sub, "sshprnamttype")
+    vote = kids.get("votingauthority")
+    if vote is not None:
+        sub = _child_map(vote)
+        row["voting_sole"]   = _ct(sub, "sole")
+        row["voting_shared"] = _ct(sub, "shared")
+        row["voting_none"]   = _ct(sub, "none")
+    if not row["value_usd_thousands"] or not row["shares_held"]:
+        # Flat SGML-style tables put <sshPrnamt>/<Sole>/... directly under
+        # <infoTable>, and lxml's recovery nests the fields that follow an
+        # unclosed tag inside it; fill the gaps from any depth.
+        deep = _descendant_map(el)
+        for key, name in _INFO_TABLE_LEAVES:
+            if not row[key]:
+                row[key] = _ct(deep, name)
+    return row
+
+
+# Spellings of the row element seen in the wild; lxml tag filters are
+# case-sensitive, unlike the ElementTree fallback below.
+_INFO_TABLE_TAGS = ("{*}infoTable", "{*}InfoTable", "{*}infotable", "{*}INFOTABLE")
+
+
+class _ParseTally:
+    """Counts holdings seen by a parser and decides which to materialize.
+
+    Building a full row dict is most of the per-holding cost, and a large
+    filer reports thousands of CUSIPs we don't track; with a `keep`
+    predicate only the interesting rows are built.  `seen` and the first
+    few CUSIPs are still recorded for diagnostics.
+    """
+
+    __slots__ = ("keep", "seen", "sample")
+
+    def __init__(self, keep: Optional[Callable[[str], bool]]) -> None:
+        self.keep = keep
+        self.seen = 0
+        self.sample: List[str] = []
+
+    def want(self, cusip: str) -> bool:
+        self.seen += 1
+        cu = cusip.strip().upper()
+        if len(self.sample) < 5:
+            self.sample.append(cu)
+        return self.keep is None or self.keep(cu)
+
+    def report(self, stats: Optional[Dict[str, Any]]) -> None:
+        if stats is not None:
+            stats["seen"] = self.seen
+            stats["sample"] = self.sample
+
+
+def _collect_info_tables(elements: Iterable[Any],
+                         keep: Optional[Callable[[str], bool]] = None,
+                         stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    tally = _ParseTally(keep)
+    out = []
+    for el in elements:
+        kids = _child_map(el)
+        cusip = _ct(kids, "cusip")
+        if cusip and tally.want(cusip):
+            out.append(_info_table_row(el, kids))
+    tally.report(stats)
+    return out
+
+
+def _iter_info_tables_lxml(context):
+    """Stream <infoTable> elements from an lxml iterparse context, freeing
+    each one once the consumer is done with it."""
+    for _, el in context:
+        yield el
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+
+
+def _normalize_recovered_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Clean a row lxml recovered from malformed markup the way
+    parse_info_table_text cleans its tag matches: upper-case CUSIP and
+    share type (default SH), no thousands separators in the numbers."""
+    row["cusip"] = row["cusip"].upper()
+    for k in ("value_usd_thousands", "shares_held",
+              "voting_sole", "voting_shared", "voting_none"):
+        row[k] = row[k].replace(",", "")
+    row["shares_type"] = (row["shares_type"] or "SH").upper()
+    return row
+
+
+def parse_info_table_xml(xml_bytes: bytes,
+                         keep: Optional[Callable[[str], bool]] = None,
+                         stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Parse an XML info table.  With `keep`, only holdings whose
+    (upper-cased) CUSIP it accepts are returned; `stats` receives the
+    number of holdings seen and a sample of their CUSIPs, plus
+    "recovered" when the markup was malformed and had to be repaired."""
     # Strip BOM and leading whitespace that can confuse the XML parser
     raw = xml_bytes.lstrip(b"\xef\xbb\xbf \t\r\n")
+    if LET is not None:
+        # One streaming, recovering pass.  The <root> wrapper (placed after
+        # any XML declaration, which carries the encoding) keeps fragments
+        # and multiple top-level <infoTable> elements; well-formed input
+        # parses exactly as it would strictly.
+        decl = _RE_XML_DECL.match(raw)
+        cut = decl.end() if decl else 0
+        context = LET.iterparse(io.BytesIO(raw[:cut] + b"<root>" + raw[cut:] + b"</root>"),
+                                events=("end",), tag=_INFO_TABLE_TAGS,
+                                recover=True, huge_tree=True,
+                                remove_comments=True, remove_pis=True)
+        try:
+            rows = _collect_info_tables(_iter_info_tables_lxml(context), keep, stats)
+        except LET.XMLSyntaxError:
+            return []
+        # Rows pulled out of broken markup (typically SGML-era filings)
+        # get the text parser's normalisation, since they skip it; the
+        # flag lets _try_parse_info_table compare against that parser.
+        if context.error_log.filter_from_errors():
+            rows = [_normalize_recovered_row(r) for r in rows]
+            if stats is not None:
+                stats["recovered"] = True
+        return rows
+
+    # No lxml: ElementTree, retrying fragments wrapped in a root element
     try:
         root = ET.fromstring(raw)
     except ET.ParseError:
@@ -643,45 +1269,14 @@ def parse_info_table_xml(xml_bytes: bytes) -> List[Dict[str, Any]]:
             root = ET.fromstring(b"<root>" + raw + b"</root>")
         except ET.ParseError:
             return []
-    out = []
-    for el in root.iter():
-        tag_local = _strip_ns(el.tag).lower()
-        if tag_local != "infotable":
-            continue
-
-        def ct(parent, name):
-            name_l = name.lower()
-            for ch in parent:
-                if _strip_ns(ch.tag).lower() == name_l:
-                    return (ch.text or "").strip()
-            return ""
-
-        row = {
-            "issuer_name": ct(el, "nameOfIssuer"),
-            "class_title": ct(el, "titleOfClass"),
-            "cusip": ct(el, "cusip"),
-            "value_usd_thousands": ct(el, "value"),
-            "put_call": ct(el, "putCall"),
-            "investment_discretion": ct(el, "investmentDiscretion"),
-            "other_manager": ct(el, "otherManager"),
-            "shares_held": "", "shares_type": "",
-            "voting_sole": "", "voting_shared": "", "voting_none": "",
-        }
-        for ch in el:
-            if _strip_ns(ch.tag).lower() == "shrsOrPrnAmt".lower():
-                row["shares_held"] = ct(ch, "sshPrnamt")
-                row["shares_type"] = ct(ch, "sshPrnamtType")
-        for ch in el:
-            if _strip_ns(ch.tag).lower() == "votingAuthority".lower():
-                row["voting_sole"]   = ct(ch, "Sole")
-                row["voting_shared"] = ct(ch, "Shared")
-                row["voting_none"]   = ct(ch, "None")
-        if row["cusip"]:
-            out.append(row)
-    return out
+    return _collect_info_tables(
+        (el for el in root.iter() if _strip_ns(el.tag).lower() == "infotable"),
+        keep, stats)
 
 
-def parse_info_table_text(content: bytes) -> List[Dict[str, Any]]:
+def parse_info_table_text(content: bytes,
+                          keep: Optional[Callable[[str], bool]] = None,
+                          stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
     """Parse a non-XML 13F info table (SGML/text/HTML format).
 
     Older filings (pre-~2013) sometimes use SGML or plain-text tables
@@ -691,6 +1286,8 @@ def parse_info_table_text(content: bytes) -> List[Dict[str, Any]]:
     A 13F info-table row contains:  issuer name, title, CUSIP (9 chars),
     value ($1k), shares/principal amount, type (SH/PRN), and optional
     put/call, discretion, voting fields.
+
+    `keep` / `stats` behave as in parse_info_table_xml.
     """
     try:
         text = content.decode("utf-8", errors="replace")
@@ -701,6 +1298,7 @@ def parse_info_table_text(content: bytes) -> List[Dict[str, Any]]:
             return []
 
     out: List[Dict[str, Any]] = []
+    tally = _ParseTally(keep)
 
     # Pattern: CUSIP (9 alphanumeric chars), followed by value and shares
     # Handles various delimiters: whitespace, pipes, tabs, XML-like tags
@@ -709,91 +1307,50 @@ def parse_info_table_text(content: bytes) -> List[Dict[str, Any]]:
     # Strategy: find every 9-char CUSIP candidate, then grab the numbers
     # on the same line (or in nearby context)
 
-    # First try: XML-like <cusip>...</cusip> tags embedded in SGML
-    cusip_tag_pattern = re.compile(
-        r'<cusip>\s*([A-Za-z0-9]{8,9})\s*</cusip>', re.I
-    )
-    value_tag = re.compile(r'<value>\s*(\d[\d,]*)\s*</value>', re.I)
-    shares_tag = re.compile(r'<sshPrnamt>\s*(\d[\d,]*)\s*</sshPrnamt>', re.I)
-    shares_type_tag = re.compile(
-        r'<sshPrnamtType>\s*(SH|PRN)\s*</sshPrnamtType>', re.I
-    )
-    name_tag = re.compile(
-        r'<nameOfIssuer>\s*([^<]+?)\s*</nameOfIssuer>', re.I
-    )
-    title_tag = re.compile(
-        r'<titleOfClass>\s*([^<]+?)\s*</titleOfClass>', re.I
-    )
-    putcall_tag = re.compile(r'<putCall>\s*([^<]*?)\s*</putCall>', re.I)
-    disc_tag = re.compile(
-        r'<investmentDiscretion>\s*([^<]*?)\s*</investmentDiscretion>', re.I
-    )
-    vs_tag = re.compile(r'<Sole>\s*(\d[\d,]*)\s*</Sole>', re.I)
-    vsh_tag = re.compile(r'<Shared>\s*(\d[\d,]*)\s*</Shared>', re.I)
-    vn_tag = re.compile(r'<None>\s*(\d[\d,]*)\s*</None>', re.I)
-
-    # Split text into info-table entries by looking for <infoTable> blocks
-    # (SGML style, may not be well-formed XML)
-    entry_pattern = re.compile(
-        r'<infoTable[^>]*>(.*?)</infoTable>', re.I | re.DOTALL
-    )
-    entries = entry_pattern.findall(text)
-
-    if entries:
-        for entry in entries:
-            cm = cusip_tag_pattern.search(entry)
-            if not cm:
+    # First try: XML-like <infoTable>/<cusip> tags embedded in SGML
+    # (may not be well-formed XML)
+    found: Optional[Dict[str, str]] = None   # fields of the open entry
+    saw_entry = False
+    for open_tag, close_tag, tag, val in _RE_IT_TOKEN.findall(text):
+        if tag:
+            if found is None:
                 continue
-            vm = value_tag.search(entry)
-            sm = shares_tag.search(entry)
-            stm = shares_type_tag.search(entry)
-            nm = name_tag.search(entry)
-            tm = title_tag.search(entry)
-            pcm = putcall_tag.search(entry)
-            dm = disc_tag.search(entry)
-            vsm = vs_tag.search(entry)
-            vshm = vsh_tag.search(entry)
-            vnm = vn_tag.search(entry)
-
-            out.append({
-                "issuer_name": nm.group(1) if nm else "",
-                "class_title": tm.group(1) if tm else "",
-                "cusip": cm.group(1).strip().upper(),
-                "value_usd_thousands": (vm.group(1).replace(",", "")
-                                        if vm else ""),
-                "shares_held": (sm.group(1).replace(",", "")
-                                if sm else ""),
-                "shares_type": stm.group(1).upper() if stm else "SH",
-                "put_call": pcm.group(1) if pcm else "",
-                "investment_discretion": dm.group(1) if dm else "",
-                "other_manager": "",
-                "voting_sole": (vsm.group(1).replace(",", "")
-                                if vsm else ""),
-                "voting_shared": (vshm.group(1).replace(",", "")
-                                  if vshm else ""),
-                "voting_none": (vnm.group(1).replace(",", "")
-                                if vnm else ""),
-            })
+            key, valid = _IT_FIELDS[tag.lower()]
+            if key in found:
+                continue    # first valid occurrence wins
+            val = val.strip()
+            if valid is None or valid(val):
+                found[key] = val
+        elif open_tag:
+            if found is None:
+                found = {}
+        elif found is not None:
+            saw_entry = True
+            if "cusip" in found and tally.want(found["cusip"]):
+                out.append({
+                    "issuer_name": found.get("issuer_name", ""),
+                    "class_title": found.get("class_title", ""),
+                    "cusip": found["cusip"].upper(),
+                    "value_usd_thousands": found.get("value_usd_thousands", "").replace(",", ""),
+                    "shares_held": found.get("shares_held", "").replace(",", ""),
+                    "shares_type": found.get("shares_type", "SH").upper(),
+                    "put_call": found.get("put_call", ""),
+                    "investment_discretion": found.get("investment_discretion", ""),
+                    "other_manager": "",
+                    "voting_sole": found.get("voting_sole", "").replace(",", ""),
+                    "voting_shared": found.get("voting_shared", "").replace(",", ""),
+                    "voting_none": found.get("voting_none", "").replace(",", ""),
+                })
+            found = None
+    if saw_entry:
+        tally.report(stats)
         return out
 
     # Fallback: look for tabular lines with CUSIP patterns
-    # CUSIP = 6 alphanumeric + 2-3 digits (8 or 9 chars total)
-    # NOTE: domestic CUSIPs start with digits (e.g., 037833100 for AAPL)
-    #       while international CINs start with letters (e.g., G1151C101).
-    #       Both must be matched.
-    line_pattern = re.compile(
-        r'(?:^|[\s|,;>])'                  # preceded by separator or tag close
-        r'([A-Z0-9][A-Z0-9]{5}\d{2,3})'   # CUSIP (8 or 9 chars, any alnum start)
-        r'[\s|,;]+'
-        r'(\d[\d,]*)'                      # value ($1000s)
-        r'[\s|,;]+'
-        r'(\d[\d,]*)'                      # shares
-        r'[\s|,;]+'
-        r'(SH|PRN)',                        # type
-        re.I | re.MULTILINE,
-    )
-    for m in line_pattern.finditer(text):
+    for m in _RE_IT_LINE.finditer("\n" + text):
         cusip = m.group(1).upper()
+        if not tally.want(cusip):
+            continue
         out.append({
             "issuer_name": "",
             "class_title": "",
@@ -806,23 +1363,110 @@ def parse_info_table_text(content: bytes) -> List[Dict[str, Any]]:
             "voting_sole": "", "voting_shared": "", "voting_none": "",
         })
 
+    tally.report(stats)
     return out
 
 
-def _try_parse_info_table(blob: bytes) -> List[Dict[str, Any]]:
-    """Try XML first, then SGML/text parser for 13F info tables."""
-    # Try XML parser
-    rows = parse_info_table_xml(blob)
-    if rows:
+def _try_parse_info_table(blob: bytes,
+                          keep: Optional[Callable[[str], bool]] = None,
+                          stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Try XML first, then SGML/text parser for 13F info tables.
+
+    Malformed markup goes to the text parser, which reads the leaf tags of
+    flat SGML-style tables wherever they sit; lxml's salvaged rows are used
+    only when it finds nothing.  A flat table with one broken tag keeps its
+    shares and voting fields:
+
+    >>> rows = _try_parse_info_table(
+    ...     b"<infoTable><cusip>037833100</cusip><value>1,234</value>"
+    ...     b"<sshPrnamt>5000</sshPrnamt><Sole>5000</Sole></infoTable>"
+    ...     b"<infoTable><cusip>594918104</infoTable>")
+    >>> [(r["cusip"], r["value_usd_thousands"], r["shares_held"],
+    ...   r["shares_type"], r["voting_sole"]) for r in rows]
+    [('037833100', '1234', '5000', 'SH', '5000')]
+    """
+    stats = {} if stats is None else stats
+    # Try XML parser; fall back only if it found no holdings at all
+    # (not merely none that `keep` accepted)
+    rows = parse_info_table_xml(blob, keep, stats)
+    if stats.get("seen") and not stats.get("recovered"):
         return rows
     # Try text/SGML parser
-    rows = parse_info_table_text(blob)
-    return rows
+    xml_stats = dict(stats)
+    stats.clear()
+    text_rows = parse_info_table_text(blob, keep, stats)
+    if not stats.get("seen") and xml_stats.get("seen"):
+        stats.clear()
+        stats.update(xml_stats)
+        return rows
+    return text_rows
+
+
+# Below this many needles a few str.__contains__ scans beat an automaton.
+AHOCORASICK_MIN_NEEDLES = 32
+
+
+class _CusipPrescan:
+    """Cheap "does this raw text mention any target CUSIP?" test.
+
+    A 9-char CUSIP can only occur where its 8-char prefix does, so just the
+    8-char (or shorter) needle per target is searched for.  With
+    pyahocorasick installed and enough targets, all needles are found in
+    one pass over the text instead of one scan per needle.
+    """
+
+    def __init__(self, target_cusips: Iterable[str]) -> None:
+        self.needles: FrozenSet[bytes] = frozenset(
+            c[:8].upper().encode("utf-8") for c in target_cusips)
+        self._automaton = None
+        if (ahocorasick is not None and b"" not in self.needles
+                and len(self.needles) >= AHOCORASICK_MIN_NEEDLES):
+            # pyahocorasick matches str only; latin-1 maps bytes 1:1 onto
+            # code points, so offsets and matches carry over unchanged.
+            automaton = ahocorasick.Automaton()
+            for n in self.needles:
+                automaton.add_word(n.decode("latin-1"), n)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def __call__(self, raw: bytes, start: int = 0, end: Optional[int] = None) -> bool:
+        """True if any needle occurs wholly inside raw[start:end]."""
+        if end is None:
+            end = len(raw)
+        if self._automaton is not None:
+            # The automaton works on a UCS-4 copy of its input, so give it
+            # just the span rather than the whole submission.
+            span = raw[start:end].decode("latin-1")
+            return next(self._automaton.iter(span), None) is not None
+        find = raw.find
+        return any(find(n, start, end) >= 0 for n in self.needles)
+
+
+class _CusipIndex:
+    """Target CUSIPs prepared for parse_full_submission_text: a row matcher
+    (calling the index tests one stripped, upper-cased CUSIP, as
+    _ParseTally.want passes it) plus the per-document prescan.  Build once
+    and reuse."""
+
+    def __init__(self, target_cusips: Iterable[str]) -> None:
+        targets = list(target_cusips)
+        # Exact CUSIPs and their 8/6-char prefixes in one set.  Entries of
+        # different lengths can't collide, so "c, c[:8] or c[:6] is in the
+        # set" accepts exactly what the separate exact/8/6 tests did.
+        keys = {c.upper() for c in targets}
+        keys.update(c[:8].upper() for c in targets if len(c) >= 8)
+        keys.update(c[:6].upper() for c in targets if len(c) >= 6)
+        self.keys: FrozenSet[str] = frozenset(keys)
+        self.prescan = _CusipPrescan(targets)
+
+    def __call__(self, cu: str) -> bool:
+        keys = self.keys
+        return cu in keys or cu[:8] in keys or cu[:6] in keys
 
 
 def parse_full_submission_text(
     blob: bytes,
-    target_cusips: Set[str],
+    target_cusips: Union[Set[str], _CusipIndex],
 ) -> List[Dict[str, Any]]:
     """Parse a full submission text file (.txt) that contains multiple
     <DOCUMENT> sections in SGML format.
@@ -831,78 +1475,165 @@ def parse_full_submission_text(
     tables as separate <DOCUMENT> blocks within one file.  This function
     splits them apart and parses each INFORMATION TABLE section
     individually, returning only holdings whose CUSIPs appear in
-    target_cusips (checked as 6/8/9-char prefixes).
+    target_cusips (checked as 6/8/9-char prefixes).  Pass a prebuilt
+    _CusipIndex (see CusipMatcher.index) to skip rebuilding it per call.
     """
-    try:
-        text = blob.decode("utf-8", errors="replace")
-    except Exception:
-        try:
-            text = blob.decode("latin-1", errors="replace")
-        except Exception:
-            return []
-
-    # Build prefix sets for quick matching
-    exact = set(c.upper() for c in target_cusips)
-    pref8 = set(c[:8].upper() for c in target_cusips if len(c) >= 8)
-    pref6 = set(c[:6].upper() for c in target_cusips if len(c) >= 6)
-
-    def cusip_matches(c: str) -> bool:
-        cu = c.strip().upper()
-        if cu in exact:
-            return True
-        if len(cu) >= 8 and cu[:8] in pref8:
-            return True
-        if len(cu) >= 6 and cu[:6] in pref6:
-            return True
-        return False
-
-    # Split into <DOCUMENT>...</DOCUMENT> blocks
-    doc_pattern = re.compile(
-        r'<DOCUMENT>(.*?)</DOCUMENT>', re.DOTALL | re.IGNORECASE
-    )
-    documents = doc_pattern.findall(text)
-    if not documents:
-        # No DOCUMENT tags — try parsing the whole blob
-        return _try_parse_info_table(blob)
+    if isinstance(target_cusips, _CusipIndex):
+        cusip_matches = target_cusips
+    else:
+        cusip_matches = _CusipIndex(target_cusips)
 
+    # Walk the <DOCUMENT>...</DOCUMENT> blocks in place in the raw bytes; a
+    # block is only copied out once the prescan says it is worth parsing,
+    # and the info-table parsers do their own decoding.
     all_rows: List[Dict[str, Any]] = []
-    for doc in documents:
-        # Check if this document contains any target CUSIPs
-        has_target = any(c in doc for c in exact)
-        if not has_target:
-            has_target = any(c in doc for c in pref8)
-        if not has_target:
+    has_target = cusip_matches.prescan
+    saw_document = False
+    for m in _RE_DOCUMENT.finditer(blob):
+        saw_document = True
+        start, end = m.span(1)
+        # Skip documents that mention none of the target CUSIPs
+        if not has_target(blob, start, end):
             continue
 
-        # Check if it's an information table type
-        type_match = re.search(
-            r'<TYPE>\s*(.*?)[\r\n]', doc, re.IGNORECASE
-        )
-        doc_type = type_match.group(1).strip().upper() if type_match else ""
-
         # Extract the <TEXT> section
-        text_match = re.search(
-            r'<TEXT>(.*?)(?:</TEXT>|$)', doc, re.DOTALL | re.IGNORECASE
-        )
+        text_match = _RE_DOC_TEXT.search(blob, start, end)
         if not text_match:
-            inner = doc
+            inner = blob[start:end]
         else:
             inner = text_match.group(1)
 
-        inner_bytes = inner.encode("utf-8", errors="replace")
-        parsed = _try_parse_info_table(inner_bytes)
-        if not parsed:
-            continue
-
-        # Keep only rows with matching CUSIPs
-        for r in parsed:
-            c = (r.get("cusip") or "").strip().upper()
-            if c and cusip_matches(c):
-                all_rows.append(r)
+        # `keep` already limits the parsers to matching CUSIPs
+        all_rows.extend(_try_parse_info_table(inner, keep=cusip_matches))
 
+    if not saw_document:
+        # No DOCUMENT tags — try parsing the whole blob
+        return _try_parse_info_table(blob)
     return all_rows
 
 
+class CusipMatcher:
+    """Match a CUSIP from a 13F filing to our allowed set.
+
+    13F filings may use 6, 8, or 9-char CUSIPs; the user's file may differ.
+    Tries exact match, then 8-char, then 6-char prefix.  Holds plain
+    dicts/sets only, so it can be pickled into parse worker processes.
+    """
+
+    def __init__(self, allowed_cusips: Set[str]) -> None:
+        self.allowed: Set[str] = set(allowed_cusips)
+        self.prefix_6: Dict[str, str] = {}  # 6-char prefix -> full cusip
+        self.prefix_8: Dict[str, str] = {}  # 8-char prefix -> full cusip
+        # Anything the 6/8-char tables miss can still prefix-match only when
+        # one side is shorter than 6 chars: a truncated CUSIP in the filing
+        # (short_prefix) or a short entry in our own list (short_lengths).
+        self.short_prefix: Dict[str, str] = {}  # 1-5 char prefix -> full cusip
+        short_lengths = set()
+        for c in self.allowed:
+            if len(c) >= 6:
+                self.prefix_6[c[:6]] = c
+            else:
+                short_lengths.add(len(c))
+            if len(c) >= 8:
+                self.prefix_8[c[:8]] = c
+            for n in range(1, min(len(c), 5) + 1):
+                self.short_prefix.setdefault(c[:n], c)
+        self.short_lengths: Tuple[int, ...] = tuple(sorted(short_lengths))
+        self._index: Optional[_CusipIndex] = None
+
+    @property
+    def index(self) -> _CusipIndex:
+        """_CusipIndex over the allowed set, built on first use (i.e. once
+        per parse worker, not in the main process)."""
+        if self._index is None:
+            self._index = _CusipIndex(self.allowed)
+        return self._index
+
+    def __call__(self, raw_cusip: str) -> Optional[str]:
+        return self.match(raw_cusip.strip().upper())
+
+    def accepts(self, c: str) -> bool:
+        """`keep` predicate for the parsers, which pass CUSIPs already
+        stripped and upper-cased."""
+        return self.match(c) is not None
+
+    def match(self, c: str) -> Optional[str]:
+        """As calling the matcher, for an already normalised CUSIP."""
+        if c in self.allowed:
+            return c
+        if len(c) >= 8 and c[:8] in self.prefix_8:
+            return self.prefix_8[c[:8]]
+        if len(c) >= 6 and c[:6] in self.prefix_6:
+            return self.prefix_6[c[:6]]
+        if not c:
+            return None
+        # Our cusip is longer than a truncated one in the filing ...
+        if len(c) < 6 and c in self.short_prefix:
+            return self.short_prefix[c]
+        # ... or one of ours is a short prefix of the filing's
+        for n in self.short_lengths:
+            if c[:n] in self.allowed:
+                return c[:n]
+        return None
+
+
+# Parse workers start from a fork server (a clean spawn where that's not
+# available) rather than fork(): the pool grows on demand from inside the
+# fetch threads, and forking while those hold requests/SSL/gzip or limiter
+# locks can deadlock the child.
+_PARSE_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+    else "spawn")
+
+
+# Set once per parse worker process by _init_parse_worker, so each task only
+# ships its blob rather than re-pickling the matcher tables every time.
+_WORKER_MATCHER: Optional[CusipMatcher] = None
+
+
+def _init_parse_worker(matcher: CusipMatcher) -> None:
+    global _WORKER_MATCHER
+    _WORKER_MATCHER = matcher
+
+
+def match_info_table_blob(
+    blob: bytes, matcher: Optional[CusipMatcher] = None,
+) -> Tuple[int, List[str], List[Tuple[str, str, Dict[str, Any]]]]:
+    """Parse one info-table document and keep holdings with our CUSIPs.
+
+    Returns (holdings parsed, first few CUSIPs seen, matches) where each
+    match is (raw_cusip, matched_cusip, row).  Runs in a parse worker
+    process, so only the matched rows are pickled back.  `matcher`
+    defaults to the one the worker was initialised with.
+    """
+    if matcher is None:
+        matcher = _WORKER_MATCHER
+    stats: Dict[str, Any] = {}
+    parsed = _try_parse_info_table(blob, keep=matcher.accepts, stats=stats)
+    matches: List[Tuple[str, str, Dict[str, Any]]] = []
+    for r in parsed:
+        raw_cusip = (r.get("cusip") or "").strip().upper()
+        matched = matcher.match(raw_cusip)
+        if matched is not None:
+            matches.append((raw_cusip, matched, r))
+    return stats.get("seen", 0), stats.get("sample", []), matches
+
+
+def match_full_submission_blob(
+    blob: bytes, matcher: Optional[CusipMatcher] = None,
+) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """parse_full_submission_text + CUSIP matching, for a parse worker."""
+    if matcher is None:
+        matcher = _WORKER_MATCHER
+    matches: List[Tuple[str, str, Dict[str, Any]]] = []
+    for r in parse_full_submission_text(blob, matcher.index):
+        raw_cusip = (r.get("cusip") or "").strip().upper()
+        matched = matcher.match(raw_cusip)
+        if matched is not None:
+            matches.append((raw_cusip, matched, r))
+    return matches
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  Ticker map + shares outstanding
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -910,17 +1641,24 @@ def parse_full_submission_text(
 def load_ticker_cusip_map(path: str) -> Dict[str, str]:
     m: Dict[str, str] = {}
     with open(path, "r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        if not reader.fieldnames:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
             return m
-        lower = [c.lower() for c in reader.fieldnames]
+        lower = [c.lower() for c in header]
         if "ticker" not in lower or "cusip" not in lower:
             raise ValueError("ticker_cusip.csv needs columns: ticker, cusip")
-        tcol = reader.fieldnames[lower.index("ticker")]
-        ccol = reader.fieldnames[lower.index("cusip")]
+        # A repeated column name resolves to its last occurrence, as it
+        # did when rows were read through csv.DictReader.
+        last = {name: i for i, name in enumerate(header)}
+        ti = last[header[lower.index("ticker")]]
+        ci = last[header[lower.index("cusip")]]
+        need = max(ti, ci) + 1
         for row in reader:
-            t = (row.get(tcol) or "").strip().upper()
-            c = (row.get(ccol) or "").strip()
+            if len(row) < need:
+                row = row + [""] * (need - len(row))
+            t = row[ti].strip().upper()
+            c = row[ci].strip()
             if t and c:
                 m[t] = c
     return m
@@ -930,11 +1668,11 @@ def build_ticker_to_issuer_cik(session: requests.Session,
                                 verbose: bool) -> Dict[str, str]:
     if verbose:
         print("Downloading SEC company_tickers.json …", flush=True)
-    data = sec_get(session, SEC_COMPANY_TICKERS).json()
+    data = _json(sec_get(session, SEC_COMPANY_TICKERS))
     if verbose:
         print(f"  Loaded {len(data)} entries.", flush=True)
     out: Dict[str, str] = {}
-    for _, row in data.items():
+    for row in data.values():
         t = (row.get("ticker") or "").strip().upper()
         c = str(row.get("cik_str") or "").strip()
         if t and c:
@@ -945,7 +1683,7 @@ def build_ticker_to_issuer_cik(session: requests.Session,
 def fetch_so_series(session: requests.Session,
                     cik: str) -> List[Tuple[dt.date, int]]:
     url = SEC_COMPANY_FACTS.format(cik=cik)
-    data = sec_get(session, url).json()
+    data = _json(sec_get(session, url))
     facts = data.get("facts", {})
 
     # Collect from ALL matching XBRL fields, not just the first
@@ -971,7 +1709,9 @@ def fetch_so_series(session: requests.Session,
         filed = v.get("filed", "")
         if end and val is not None:
             try:
-                ival = int(float(val))
+                # orjson/json hand back ints as ints; only strings and
+                # floats need the float() round trip.
+                ival = val if type(val) is int else int(float(val))
                 if ival <= 0:
                     continue
                 if end not in by_date or filed < by_date[end][0]:
@@ -1017,51 +1757,59 @@ SO_EXPECTED_RANGES: Dict[str, List[Tuple[dt.date, dt.date, int, int, Optional[in
     ],
 }
 
+# Per ticker: era start dates (sorted) alongside their SO_EXPECTED_RANGES
+# entries, so _validate_so can bisect to the era instead of scanning.
+_SO_ERA_INDEX: Dict[str, Tuple[List[dt.date], List[Tuple[dt.date, dt.date, int, int, Optional[int]]]]] = {
+    t: ([e[0] for e in sorted(eras)], sorted(eras))
+    for t, eras in SO_EXPECTED_RANGES.items()
+}
+
 _so_fix_log: List[str] = []   # first N corrections logged
 
 
+def _log_so_fix(msg: str) -> None:
+    if len(_so_fix_log) < 10:
+        _so_fix_log.append(msg)
+        print(msg, flush=True)
+
+
 def _validate_so(ticker: str, report_date: dt.date,
                  raw_so: int, verbose: bool = False) -> Optional[int]:
     """Validate SO against known expected ranges.
 
     Returns corrected SO, or None if unrecoverable.
     """
-    ranges = SO_EXPECTED_RANGES.get(ticker.upper())
-    if not ranges:
+    era_index = _SO_ERA_INDEX.get(ticker.upper())
+    if era_index is None:
         return raw_so  # unknown ticker → pass through
-
-    for era_start, era_end, min_so, max_so, fix_div in ranges:
-        if era_start <= report_date <= era_end:
-            # In range → good
-            if min_so <= raw_so <= max_so:
-                return raw_so
-            # Too high → try dividing by fix_divisor
-            if raw_so > max_so and fix_div:
-                fixed = raw_so // fix_div
-                if min_so <= fixed <= max_so:
-                    if verbose and len(_so_fix_log) < 10:
-                        _so_fix_log.append(
-                            f"    ⚡ SO fix {ticker} {report_date}: "
-                            f"{raw_so:,} → {fixed:,} (÷{fix_div})")
-                        print(_so_fix_log[-1], flush=True)
-                    return fixed
-            # Too low → try multiplying by fix_divisor
-            if raw_so < min_so and fix_div:
-                fixed = raw_so * fix_div
-                if min_so <= fixed <= max_so:
-                    if verbose and len(_so_fix_log) < 10:
-                        _so_fix_log.append(
-                            f"    ⚡ SO fix {ticker} {report_date}: "
-                            f"{raw_so:,} → {fixed:,} (×{fix_div})")
-                        print(_so_fix_log[-1], flush=True)
-                    return fixed
-            # Unrecoverable — value doesn't fit any correction
-            if verbose and len(_so_fix_log) < 10:
-                _so_fix_log.append(
-                    f"    ⚠ SO reject {ticker} {report_date}: "
-                    f"{raw_so:,} (expected {min_so:,}–{max_so:,})")
-                print(_so_fix_log[-1], flush=True)
-            return None
+    starts, ranges = era_index
+    i = bisect.bisect_right(starts, report_date) - 1
+    if i >= 0 and report_date <= ranges[i][1]:
+        _, _, min_so, max_so, fix_div = ranges[i]
+        # In range → good
+        if min_so <= raw_so <= max_so:
+            return raw_so
+        # Too high → try dividing by fix_divisor
+        if raw_so > max_so and fix_div:
+            fixed = raw_so // fix_div
+            if min_so <= fixed <= max_so:
+                if verbose:
+                    _log_so_fix(f"    ⚡ SO fix {ticker} {report_date}: "
+                                f"{raw_so:,} → {fixed:,} (÷{fix_div})")
+                return fixed
+        # Too low → try multiplying by fix_divisor
+        if raw_so < min_so and fix_div:
+            fixed = raw_so * fix_div
+            if min_so <= fixed <= max_so:
+                if verbose:
+                    _log_so_fix(f"    ⚡ SO fix {ticker} {report_date}: "
+                                f"{raw_so:,} → {fixed:,} (×{fix_div})")
+                return fixed
+        # Unrecoverable — value doesn't fit any correction
+        if verbose:
+            _log_so_fix(f"    ⚠ SO reject {ticker} {report_date}: "
+                        f"{raw_so:,} (expected {min_so:,}–{max_so:,})")
+        return None
 
     return raw_so  # no matching era → pass through
 
@@ -1103,10 +1851,96 @@ def write_csv(path: str, cols: List[str], rows: List[Dict[str, Any]]) -> None:
     if d:
         os.makedirs(d, exist_ok=True)
     with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=cols, extrasaction="ignore")
-        w.writeheader()
-        for r in rows:
-            w.writerow({k: r.get(k, "") for k in cols})
+        # Plain writer over projected lists: DictWriter would rebuild a
+        # dict per row and re-check it against the fieldnames.
+        w = csv.writer(f)
+        w.writerow(cols)
+        w.writerows([r.get(k, "") for k in cols] for r in rows)
+
+
+# Parquet column typing: counts are int64 (empty -> null), low-cardinality
+# labels are dictionary-encoded, everything else stays a string so CUSIPs
+# and accessions keep their leading zeros.
+PARQUET_INT_COLUMNS = {
+    "shares_held", "value_usd_thousands", "shares_outstanding",
+    "voting_sole", "voting_shared", "voting_none", "num_filer_ciks",
+    "shares_held_total", "value_usd_thousands_total", "num_managers",
+}
+PARQUET_DICT_COLUMNS = {"group", "ticker", "mapped_cusip", "form",
+                        "shares_type", "consolidation_note"}
+
+
+def _parquet_str_array(pa: Any, vals: List[Any]) -> Any:
+    """String column: None -> "", anything else str()'d.  Columns that are
+    already all str/None are converted by Arrow in one call."""
+    try:
+        arr = pa.array(vals, type=pa.string())
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        return pa.array(["" if v is None else str(v) for v in vals],
+                        type=pa.string())
+    return arr.fill_null("") if arr.null_count else arr
+
+
+def _parquet_int_array(pa: Any, vals: List[Any]) -> Any:
+    """int64 column: empty -> null, otherwise safe_int.  Plain digit
+    strings (the usual case) are parsed by Arrow's cast kernel; any value
+    it rejects sends the whole column through safe_int instead."""
+    import pyarrow.compute as pc
+    try:
+        arr = pa.array(vals, type=pa.string())
+        arr = pc.if_else(pc.equal(arr, ""), None, arr)
+        return pc.cast(arr, pa.int64())
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        return pa.array([safe_int(v) if v not in (None, "") else None
+                         for v in vals], type=pa.int64())
+
+
+def write_parquet(path: str, cols: List[str], rows: List[Dict[str, Any]]) -> None:
+    """Write rows as a zstd-compressed Parquet file (requires pyarrow)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    arrays = []
+    for c in cols:
+        vals = [r.get(c, "") for r in rows]
+        if c in PARQUET_INT_COLUMNS:
+            arr = _parquet_int_array(pa, vals)
+        else:
+            arr = _parquet_str_array(pa, vals)
+            if c in PARQUET_DICT_COLUMNS:
+                arr = arr.dictionary_encode()
+        arrays.append(arr)
+    table = pa.Table.from_arrays(arrays, names=cols)
+    pq.write_table(table, path, compression="zstd", compression_level=3)
+
+
+def write_table(path: str, cols: List[str], rows: List[Dict[str, Any]],
+                fmt: str = "csv") -> str:
+    """Write rows as CSV or Parquet; `path` is given with a .csv suffix and
+    swapped to .parquet as needed.  Returns the path written."""
+    if fmt == "parquet":
+        path = os.path.splitext(path)[0] + ".parquet"
+        write_parquet(path, cols, rows)
+    else:
+        write_csv(path, cols, rows)
+    return path
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Suspend cyclic GC while bulk-building containers.  Every accumulator
+    allocated in a tight loop otherwise nudges the collector into rescanning
+    all the (long-lived) raw row dicts.  Also usable as a decorator."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
 
 
 def _recency(form, filing_date, accession):
@@ -1115,6 +1949,7 @@ def _recency(form, filing_date, accession):
             accession or "")
 
 
+@_gc_paused()
 def dedupe_raw(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Deduplicate raw holdings: keep the best FILING per (CIK, report_date, ticker).
 
@@ -1170,84 +2005,93 @@ def dedupe_raw(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
                                    key=lambda a: len(acc_dict[a]))
                 out.extend(acc_dict[fallback_acc])
 
-    out.sort(key=lambda r: (
+    # Sort on one packed string rather than a (ticker, date, date, acc)
+    # tuple: each comparison is then a single C-level string compare.
+    # NUL sorts below any character a field can hold, so the order is
+    # the same as the tuple's.
+    out.sort(key=lambda r: "\0".join((
         r.get("ticker", ""),
-        _sort_date(r.get("report_date")),
-        _sort_date(r.get("filing_date")),
+        _sort_iso(r.get("report_date")),
+        _sort_iso(r.get("filing_date")),
         r.get("accession", ""),
-    ))
+    )))
     return out
 
 
 def build_panel(group: str,
                 raw_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    by_key: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
-    for r in raw_rows:
-        by_key[(r.get("ticker", ""), r.get("report_date", ""))].append(r)
+    # One pass over the raw rows, accumulating straight into a flat
+    # (ticker, report_date, filer_cik) table.  Each slot is
+    #   [shares, value, filing_date, filing_date_key, accession,
+    #    shares_outstanding, mapped_cusip]
+    # so the hot loop does no nested dict lookups.
+    no_date = _sort_date("")
+    by_filer: Dict[Tuple[str, str, str], List[Any]] = {}
+    with _gc_paused():
+        for r in raw_rows:
+            get = r.get
+            k = (get("ticker", ""), get("report_date", ""), get("filer_cik", ""))
+            acc = by_filer.get(k)
+            if acc is None:
+                acc = by_filer[k] = [0, 0, "", no_date, "", "", ""]
+            acc[0] += safe_int(get("shares_held"))
+            acc[1] += safe_int(get("value_usd_thousands"))
+            fd_key = _sort_date(get("filing_date"))
+            if fd_key > acc[3]:
+                acc[2] = get("filing_date", "")
+                acc[3] = fd_key
+                acc[4] = get("accession", "")
+            if not acc[5]:
+                so = get("shares_outstanding")
+                if so:
+                    acc[5] = so
+            if not acc[6]:
+                acc[6] = get("mapped_cusip", "")
+
+        # Filers per (ticker, report_date), in first-seen order.
+        by_key: Dict[Tuple[str, str], List[Tuple[str, List[Any]]]] = defaultdict(list)
+        for (ticker, report_date, fc), acc in by_filer.items():
+            by_key[(ticker, report_date)].append((fc, acc))
+
+        # Emit in (ticker, report date) order so the output needs no sort.
+        out = []
+        for ticker, report_date in sorted(
+                by_key, key=lambda k: (k[0], _sort_date(k[1]))):
+            filers = by_key[(ticker, report_date)]
+            # One pass over the filers: the max-shares filer, the latest
+            # filing, the first SO / mapped CUSIP and the CIK list.
+            # Parent CIKs (e.g. BlackRock Inc) already include subsidiary
+            # holdings (e.g. BlackRock Advisors), so the group total is the
+            # MAX across CIKs (first one wins ties), not the sum.
+            so, latest_fd, latest_acc, mcusip = "", "", "", ""
+            latest_key = no_date
+            max_fc, max_info = filers[0]
+            fcs = []
+            for fc, info in filers:
+                fcs.append(fc)
+                if info[0] > max_info[0]:
+                    max_fc, max_info = fc, info
+                if info[5]:
+                    so = info[5]
+                if info[3] > latest_key:
+                    latest_fd, latest_key, latest_acc = info[2], info[3], info[4]
+                if not mcusip:
+                    mcusip = info[6]
+            total_sh, total_val = max_info[0], max_info[1]
+            note = ("SINGLE_FILER" if len(filers) == 1
+                    else f"MAX_FILER({max_fc})")
 
-    out = []
-    for (ticker, report_date), recs in by_key.items():
-        by_filer: Dict[str, Dict[str, Any]] = {}
-        for r in recs:
-            fc = r.get("filer_cik", "")
-            if fc not in by_filer:
-                by_filer[fc] = {
-                    "shares": 0, "value": 0,
-                    "filing_date": "", "accession": "",
-                    "shares_outstanding": "", "mapped_cusip": "",
-                }
-            by_filer[fc]["shares"] += safe_int(r.get("shares_held"))
-            by_filer[fc]["value"]  += safe_int(r.get("value_usd_thousands"))
-            if _sort_date(r.get("filing_date")) > _sort_date(
-                by_filer[fc]["filing_date"]
-            ):
-                by_filer[fc]["filing_date"] = r.get("filing_date", "")
-                by_filer[fc]["accession"]   = r.get("accession", "")
-            if not by_filer[fc]["shares_outstanding"] and r.get("shares_outstanding"):
-                by_filer[fc]["shares_outstanding"] = r.get("shares_outstanding", "")
-            if not by_filer[fc]["mapped_cusip"]:
-                by_filer[fc]["mapped_cusip"] = r.get("mapped_cusip", "")
-
-        filers = list(by_filer.items())
-        filer_ciks = [fc for fc, _ in filers]
-
-        if len(filers) == 1:
-            fc, info = filers[0]
-            total_sh, total_val = info["shares"], info["value"]
-            note = "SINGLE_FILER"
-        else:
-            # Parent CIKs (e.g. BlackRock Inc) already include
-            # subsidiary holdings (e.g. BlackRock Advisors).
-            # Take MAX across CIKs to avoid double-counting.
-            shares_list = [(fc, info["shares"]) for fc, info in filers]
-            max_fc, max_sh = max(shares_list, key=lambda x: x[1])
-            total_sh = max_sh
-            total_val = by_filer[max_fc]["value"]
-            note = f"MAX_FILER({max_fc})"
-
-        so, latest_fd, latest_acc, mcusip = "", "", "", ""
-        for fc, info in filers:
-            if info["shares_outstanding"]:
-                so = info["shares_outstanding"]
-            if _sort_date(info["filing_date"]) > _sort_date(latest_fd):
-                latest_fd = info["filing_date"]
-                latest_acc = info["accession"]
-            if not mcusip:
-                mcusip = info["mapped_cusip"]
-
-        out.append({
-            "group": group, "ticker": ticker, "mapped_cusip": mcusip,
-            "report_date": report_date,
-            "shares_held": total_sh, "value_usd_thousands": total_val,
-            "num_filer_ciks": len(filers),
-            "filer_ciks_used": ";".join(filer_ciks),
-            "consolidation_note": note,
-            "latest_filing_date": latest_fd, "latest_accession": latest_acc,
-            "shares_outstanding": so,
-        })
+            out.append({
+                "group": group, "ticker": ticker, "mapped_cusip": mcusip,
+                "report_date": report_date,
+                "shares_held": total_sh, "value_usd_thousands": total_val,
+                "num_filer_ciks": len(filers),
+                "filer_ciks_used": ";".join(fcs),
+                "consolidation_note": note,
+                "latest_filing_date": latest_fd, "latest_accession": latest_acc,
+                "shares_outstanding": so,
+            })
 
-    out.sort(key=lambda r: (r.get("ticker", ""),
-                            _sort_date(r.get("report_date"))))
     return out
 
 
@@ -1292,7 +2136,8 @@ def build_bvs(
 
 def generate_ownership_chart(bvs_csv_path: str, out_dir: str,
                              verbose: bool = True) -> Optional[str]:
-    """Read BVS panel CSV, compute per-ticker ownership %, save a chart.
+    """Read BVS panel CSV (or .parquet), compute per-ticker ownership %,
+    save a chart.
 
     Plots one line per ticker showing BVS (BlackRock+Vanguard+StateStreet)
     institutional ownership percentage over time.
@@ -1308,57 +2153,67 @@ def generate_ownership_chart(bvs_csv_path: str, out_dir: str,
                   "Install with: pip install matplotlib", flush=True)
         return None
 
-    rows = []
-    with open(bvs_csv_path, "r", encoding="utf-8") as f:
-        for r in csv.DictReader(f):
-            rows.append(r)
-
-    if not rows:
-        if verbose:
-            print("WARNING: BVS CSV is empty, skipping chart.", flush=True)
-        return None
+    if bvs_csv_path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        rows: Iterable[Dict[str, Any]] = pq.read_table(bvs_csv_path).to_pylist()
+        f = None
+    else:
+        # Stream the CSV rather than materialising it; rows are filtered
+        # as they are read.
+        f = open(bvs_csv_path, "r", encoding="utf-8")
+        rows = csv.DictReader(f)
 
     # Build per-ticker time series
     ticker_series: Dict[str, List[Tuple[dt.date, float]]] = defaultdict(list)
+    n_rows = 0
     skipped = 0
     tickers_seen: Set[str] = set()
     max_date = dt.date(2025, 12, 31)  # cap chart at end of 2025
 
-    for r in rows:
-        ticker = r.get("ticker", "")
-        rd_str = r.get("report_date", "")
-        sh = safe_int(r.get("shares_held_total"))
-        so = safe_int(r.get("shares_outstanding"))
-        nm = safe_int(r.get("num_managers")) or 0
-        if not rd_str or not ticker:
-            continue
-        rd = parse_date(rd_str)
-        if not rd:
-            skipped += 1
-            continue
-        # Cap at max_date
-        if rd > max_date:
-            skipped += 1
-            continue
-        if so <= 0 or sh <= 0:
-            skipped += 1
-            continue
-        # Skip partial quarters (not all 3 managers reported)
-        if nm < 3:
-            skipped += 1
-            continue
-        # Validate SO against expected ranges (safety net)
-        validated_so = _validate_so(ticker, rd, so)
-        if validated_so is None:
-            skipped += 1
-            continue
-        pct = (sh / validated_so) * 100.0
-        # Sanity check: BVS combined ownership should be 2-25%
-        if pct > 25.0 or pct < 1.0:
-            skipped += 1
-            continue
-        tickers_seen.add(ticker)
-        ticker_series[ticker].append((rd, pct))
+    # Rejections run cheapest-first (string tests, integer parses, then the
+    # date).  A row is counted in `skipped` at most once whichever test
+    # rejects it, so the reported total does not depend on this order.
+    try:
+        for r in rows:
+            n_rows += 1
+            ticker = r.get("ticker", "")
+            rd_str = r.get("report_date", "")
+            if not rd_str or not ticker:
+                continue
+            # Skip partial quarters (not all 3 managers reported)
+            if safe_int(r.get("num_managers")) < 3:
+                skipped += 1
+                continue
+            so = safe_int(r.get("shares_outstanding"))
+            sh = safe_int(r.get("shares_held_total"))
+            if so <= 0 or sh <= 0:
+                skipped += 1
+                continue
+            rd = parse_date(rd_str)
+            # Cap at max_date
+            if not rd or rd > max_date:
+                skipped += 1
+                continue
+            # Validate SO against expected ranges (safety net)
+            validated_so = _validate_so(ticker, rd, so)
+            if validated_so is None:
+                skipped += 1
+                continue
+            pct = (sh / validated_so) * 100.0
+            # Sanity check: BVS combined ownership should be 2-25%
+            if pct > 25.0 or pct < 1.0:
+                skipped += 1
+                continue
+            tickers_seen.add(ticker)
+            ticker_series[ticker].append((rd, pct))
+    finally:
+        if f is not None:
+            f.close()
+
+    if not n_rows:
+        if verbose:
+            print("WARNING: BVS CSV is empty, skipping chart.", flush=True)
+        return None
 
     if not ticker_series:
         if verbose:
@@ -1472,14 +2327,34 @@ def main() -> None:
     ap.add_argument("--ticker-cusip-csv",
                     default=os.path.join(os.path.expanduser("~"),
                                          "ticker_cusip.csv"))
-    ap.add_argument("--sleep", type=float, default=0.25)
+    ap.add_argument("--sleep", type=float, default=0.0,
+                    help="Ignored; kept so old command lines still parse.  "
+                         "SEC requests are paced by a shared rate limiter "
+                         "instead, and cached documents cost nothing.")
     ap.add_argument("--no-auto-cik", action="store_true")
     ap.add_argument("--auto-cik-max", type=int, default=350)
     ap.add_argument("--mode", choices=["raw", "panel"])
     ap.add_argument("--quiet", action="store_true")
     ap.add_argument("--no-chart", action="store_true",
                     help="Skip ownership-%% chart (panel mode only)")
+    ap.add_argument("--cache-dir", default=None,
+                    help="Where to cache master.idx files "
+                         "(default: <out-dir>/.edgar_cache)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Always re-download master.idx files")
+    ap.add_argument("--cache-filings", action="store_true",
+                    help="Also keep filing documents (index.json, info "
+                         "tables, full submissions) under --cache-dir; "
+                         "they never change, so re-runs skip downloading "
+                         "them.  Can use a lot of disk.")
+    ap.add_argument("--format", choices=["csv", "parquet"], default="csv",
+                    help="Output file format (parquet needs pyarrow)")
     args = ap.parse_args()
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            ap.error("--format parquet requires pyarrow: pip install pyarrow")
 
     verbose = not args.quiet
 
@@ -1499,11 +2374,7 @@ def main() -> None:
     out_dir = os.path.abspath(os.path.expanduser(args.out_dir))
     os.makedirs(out_dir, exist_ok=True)
 
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": args.user_agent,
-        "Accept-Encoding": "gzip, deflate",
-    })
+    session = build_session(args.user_agent)
 
     min_report   = dt.date.fromisoformat(min_report_str)
     # Start scanning from January of the min_report year
@@ -1525,36 +2396,13 @@ def main() -> None:
         cusip_to_tickers[c].append(t)
     allowed_cusips: Set[str] = set(cusip_to_tickers.keys())
 
-    # Build prefix-based CUSIP lookup for flexible matching
-    # 13F filings may use 6, 8, or 9-char CUSIPs; user's file may differ
-    cusip_prefix_6: Dict[str, str] = {}  # 6-char prefix -> full cusip
-    cusip_prefix_8: Dict[str, str] = {}  # 8-char prefix -> full cusip
-    for c in allowed_cusips:
-        if len(c) >= 6:
-            cusip_prefix_6[c[:6]] = c
-        if len(c) >= 8:
-            cusip_prefix_8[c[:8]] = c
-
-    def match_cusip(raw_cusip: str) -> Optional[str]:
-        """Match a CUSIP from a 13F filing to our allowed set.
-        Tries exact match, then 8-char, then 6-char prefix."""
-        c = raw_cusip.strip().upper()
-        if c in allowed_cusips:
-            return c
-        if len(c) >= 8 and c[:8] in cusip_prefix_8:
-            return cusip_prefix_8[c[:8]]
-        if len(c) >= 6 and c[:6] in cusip_prefix_6:
-            return cusip_prefix_6[c[:6]]
-        # Also try: our cusip is 9-char, filing has 8-char
-        for ac in allowed_cusips:
-            if ac.startswith(c) or c.startswith(ac):
-                return ac
-        return None
+    # Prefix-based CUSIP lookup for flexible matching
+    match_cusip = CusipMatcher(allowed_cusips)
 
     if verbose:
         print(f"CUSIP lookup: {len(allowed_cusips)} exact, "
-              f"{len(cusip_prefix_8)} 8-char, "
-              f"{len(cusip_prefix_6)} 6-char prefixes", flush=True)
+              f"{len(match_cusip.prefix_8)} 8-char, "
+              f"{len(match_cusip.prefix_6)} 6-char prefixes", flush=True)
         for c in sorted(allowed_cusips):
             tickers = cusip_to_tickers[c]
             print(f"  {c} -> {', '.join(tickers)}", flush=True)
@@ -1562,8 +2410,18 @@ def main() -> None:
     # ── Shares outstanding (issuer CIK lookup) ──
     ticker_to_issuer_cik = build_ticker_to_issuer_cik(session, verbose)
     so_cache: Dict[str, List[Tuple[dt.date, int]]] = {}
+    # Every filer's row for a ticker in a quarter asks the same question,
+    # so the picked value is memoised per (ticker, report date) as well.
+    so_by_quarter: Dict[Tuple[str, str], Optional[int]] = {}
 
     def get_so(ticker: str, rd_str: str) -> Optional[int]:
+        key = (ticker, rd_str)
+        if key in so_by_quarter:
+            return so_by_quarter[key]
+        so_by_quarter[key] = so = _get_so(ticker, rd_str)
+        return so
+
+    def _get_so(ticker: str, rd_str: str) -> Optional[int]:
         d = parse_date(rd_str)
         if not d:
             return None
@@ -1595,34 +2453,28 @@ def main() -> None:
         if verbose:
             print("Auto-expanding CIKs …", flush=True)
         companies = list(
-            sec_get(session, SEC_COMPANY_TICKERS).json().values()
+            _json(sec_get(session, SEC_COMPANY_TICKERS)).values()
         )
+        # Lower-case each title once for every group's keyword tests.  (A
+        # handful of keywords is well under AHOCORASICK_MIN_NEEDLES, so
+        # plain substring tests stay.)
+        titles = [((c.get("title") or "").lower(), c) for c in companies]
         for g, cfg in GROUPS.items():
             kws = [k.lower().strip() for k in cfg["keywords"]]
-            cands = [c for c in companies
-                     if any(kw in (c.get("title") or "").lower() for kw in kws)]
-            cands.sort(key=lambda c: (
-                -sum(1 for kw in kws
-                     if kw in (c.get("title") or "").lower()),
-                len(c.get("title") or ""),
-            ))
-            cands = cands[:args.auto_cik_max]
-            verified: Set[str] = set(pad_cik(x) for x in cfg["seed_ciks"])
+            # Most keyword hits first, then shortest title; ties keep
+            # company_tickers order.
+            scored = []
+            for title, c in titles:
+                hits = sum(1 for kw in kws if kw in title)
+                if hits:
+                    scored.append((-hits, len(c.get("title") or ""), c))
+            scored.sort(key=lambda s: s[:2])
+            cands = [c for _, _, c in scored[:args.auto_cik_max]]
             if verbose:
                 print(f"  {g}: checking {len(cands)} candidates …", flush=True)
-            for i, c in enumerate(cands, 1):
-                cik = str(c.get("cik_str") or "").strip()
-                if not cik:
-                    continue
-                cp = pad_cik(cik)
-                if cp in verified:
-                    continue
-                if _submissions_has_13f(session, cp, start_filing):
-                    verified.add(cp)
-                if verbose and (i % 50 == 0 or i == len(cands)):
-                    print(f"    scanned {i}/{len(cands)}, "
-                          f"verified={len(verified)}", flush=True)
-                time.sleep(0.02)
+            verified = verify_candidate_ciks(
+                session, cands, (pad_cik(x) for x in cfg["seed_ciks"]),
+                start_filing, verbose=verbose)
             group_ciks[g] = sorted(verified)
             if verbose:
                 print(f"  {g}: using {len(group_ciks[g])} CIK(s).", flush=True)
@@ -1636,20 +2488,25 @@ def main() -> None:
             cik_to_group[c] = g
 
     # ── Clean stale outputs ──
-    if want_panel:
-        for g in GROUPS:
-            delete_stale(os.path.join(out_dir, f"{g}_13f_holdings_raw.csv"))
-    else:
-        for g in GROUPS:
-            delete_stale(os.path.join(out_dir, f"{g}_13f_holdings_panel.csv"))
-        delete_stale(os.path.join(out_dir, "BVS_13f_holdings_panel.csv"))
+    for ext in (".csv", ".parquet"):
+        if want_panel:
+            for g in GROUPS:
+                delete_stale(os.path.join(out_dir, f"{g}_13f_holdings_raw{ext}"))
+        else:
+            for g in GROUPS:
+                delete_stale(os.path.join(out_dir, f"{g}_13f_holdings_panel{ext}"))
+            delete_stale(os.path.join(out_dir, f"BVS_13f_holdings_panel{ext}"))
+    if not want_panel:
         delete_stale(os.path.join(out_dir, "ownership_pct_chart.png"))
 
     # ══════════════════════════════════════════════════════════════════════
     #  STEP 1:  Discover filings via quarterly full-index (v22 core change)
     # ══════════════════════════════════════════════════════════════════════
+    cache_dir = None if args.no_cache else os.path.abspath(
+        os.path.expanduser(args.cache_dir or os.path.join(out_dir, ".edgar_cache")))
+    set_archive_cache_dir(cache_dir if args.cache_filings else None)
     index_entries = discover_filings_via_full_index(
-        session, all_ciks, start_filing, verbose=verbose,
+        session, all_ciks, start_filing, verbose=verbose, cache_dir=cache_dir,
     )
 
     # Deduplicate by (cik, accession) — keep latest entry
@@ -1658,6 +2515,7 @@ def main() -> None:
         key = (e["cik"], e["accession"])
         seen_acc[key] = e   # last wins (later entries = amendments)
     unique_entries = list(seen_acc.values())
+    del seen_acc, index_entries   # superseded duplicates can be freed now
 
     # Sort by filing date for orderly processing
     unique_entries.sort(key=lambda e: (e.get("filing_date", ""), e["accession"]))
@@ -1680,343 +2538,343 @@ def main() -> None:
     # ══════════════════════════════════════════════════════════════════════
     #  STEP 2:  Process each group — extract holdings from each filing
     # ══════════════════════════════════════════════════════════════════════
-    panel_by_group: Dict[str, List[Dict[str, Any]]] = {}
-
-    for group in group_ciks:
-        if verbose:
-            print(f"\n{'='*60}", flush=True)
-            print(f"  {group}  ({len(entries_by_group.get(group, []))} filings "
-                  f"from {len(group_ciks[group])} CIK(s))", flush=True)
-            print(f"{'='*60}", flush=True)
-
-        filings = entries_by_group.get(group, [])
-        raw_rows: List[Dict[str, Any]] = []
-        _diag_empty_count = [0]  # mutable counter for diagnostic limiting
-        _diag_success_count = [0]  # first N successful extractions shown
-
-        for i, entry in enumerate(filings, 1):
-            cik_p = entry["cik"]
-            cik_i = entry.get("cik_int", cik_int_str(cik_p))
-            form  = entry["form"]
-            acc   = entry["accession"]
-            f_date = entry["filing_date"]
-
-            base_url = _filing_base_url(cik_i, acc)
-
-            # ── Get report_date ──
-            # Try extracting from filing primary doc; fall back to heuristic
-            rep_str = extract_report_date(session, base_url)
-            if not rep_str:
-                rep_str = guess_report_date(f_date)
-
-            rep_d = parse_date(rep_str)
-            if rep_d and rep_d < min_report:
+    # Network + parse work for each filing runs on FILING_FETCH_WORKERS
+    # threads (paced by sec_get's token bucket); CPU-bound parsing is handed
+    # to a process pool.  Row building, SO lookups and logging stay on the
+    # main thread, which consumes results in filing order.
+    def fetch_filing(entry: Dict[str, str]) -> FilingResult:
+        cik_p = entry["cik"]
+        cik_i = entry.get("cik_int") or cik_int_str(cik_p)
+        acc   = entry["accession"]
+        base_url = _filing_base_url(cik_i, acc)
+        res = FilingResult(entry=entry, base_url=base_url)
+
+        # ── Get report_date ──
+        # Try extracting from filing primary doc; fall back to heuristic.
+        # index.json is needed for the info-table search below anyway
+        # (and cached); fetching it first tells us which primary docs
+        # exist.
+        try:
+            listing: Optional[Set[str]] = {
+                it.get("name") or ""
+                for it in _filing_index_items(session, base_url)}
+        except Exception:
+            listing = None
+        res.rep_str = extract_report_date(session, base_url,
+                                          available=listing)
+        if not res.rep_str:
+            res.rep_str = guess_report_date(entry["filing_date"])
+
+        rep_d = parse_date(res.rep_str)
+        if rep_d and rep_d < min_report:
+            res.skipped = True
+            return res
+
+        # ── Find + parse info table ──
+        res.urls = find_info_table_urls(session, base_url)
+        if not res.urls:
+            return res
+
+        for url in res.urls:
+            try:
+                blob = archive_get(session, url)
+                # Try both XML and text parsers
+                n_parsed, sample, matches = parse_pool.submit(
+                    match_info_table_blob, blob
+                ).result()
+            except Exception:
                 continue
-
-            if verbose:
-                print(f"  [{i}/{len(filings)}] {form} filed {f_date} "
-                      f"report {rep_str or '???'} CIK {cik_p}", flush=True)
-
-            # ── Find + parse info table ──
-            urls = find_info_table_urls(session, base_url)
-            if not urls:
-                if verbose and rep_d and rep_d.year <= 2013:
-                    print(f"    ⚠ No info table URLs found at {base_url}",
-                          flush=True)
-                time.sleep(args.sleep)
+            if not n_parsed:
                 continue
-
-            extracted = False
-            diag_total_parsed = 0
-            diag_sample_cusips: List[str] = []
-            tried_urls: Set[str] = set()
-
-            for url in urls:
-                tried_urls.add(url)
+            res.total_parsed += n_parsed
+            res.sample_cusips.extend(sample[:5 - len(res.sample_cusips)])
+            if matches:
+                res.matches = matches
+                res.source_url = url
+                break
+
+        # ── FALLBACK: parse full submission text file ──
+        # Old filings (pre-~2013) bundle domestic + international
+        # info tables as separate <DOCUMENT> sections within one
+        # big .txt file.  The scored candidates often only hit the
+        # international section.  parse_full_submission_text splits
+        # on <DOCUMENT> boundaries and searches each section for
+        # our target CUSIPs.
+        if not res.matches:
+            # CRITICAL: the full submission text file is at the
+            # PARENT directory level, NOT inside the filing dir.
+            #   ✓ .../000136474210000027.txt   (parent level)
+            #   ✗ .../000136474210000027/0001364742-10-000027.txt
+            fsub_urls: List[str] = []
+            # 1) Parent-level full submission text
+            fsub_urls.append(base_url.rstrip("/") + ".txt")
+            # 2) Accession-named file inside directory (backup)
+            fsub_urls.append(f"{base_url}{acc}.txt")
+            # 3) Any large .txt files from index.json
+            listed_size: Dict[str, int] = {}
+            try:
+                sized2 = [(int(it2.get("size") or 0), it2) for it2 in
+                          _filing_index_items(session, base_url)]
+                sized2.sort(key=lambda x: x[0], reverse=True)
+                for sz2, it2 in sized2:
+                    n2 = (it2.get("name") or "").lower()
+                    furl2 = base_url + (it2.get("name") or "")
+                    listed_size[furl2] = sz2
+                    if n2.endswith(".txt") and sz2 > 100_000:
+                        if furl2 not in fsub_urls:
+                            fsub_urls.append(furl2)
+            except Exception:
+                pass
+
+            # These candidates are usually the same submission under
+            # different names.  Once one has been downloaded and held no
+            # target CUSIPs, skip listed files of exactly the same size
+            # rather than pull another multi-MB copy.
+            seen_fsub: Set[str] = set()
+            no_match_sizes: Set[int] = set()
+            for fsub_url in fsub_urls:
+                if fsub_url in seen_fsub:
+                    continue
+                seen_fsub.add(fsub_url)
+                if listed_size.get(fsub_url) in no_match_sizes:
+                    continue
                 try:
-                    blob = sec_get(session, url).content
-                    # Try both XML and text parsers
-                    parsed = _try_parse_info_table(blob)
-                    if not parsed:
-                        continue
-                    diag_total_parsed += len(parsed)
-                    for r in parsed:
-                        raw_cusip = (r.get("cusip") or "").strip().upper()
-                        if not raw_cusip:
-                            continue
-                        # Collect sample CUSIPs for diagnostics
-                        if len(diag_sample_cusips) < 5:
-                            diag_sample_cusips.append(raw_cusip)
-
-                        matched_cusip = match_cusip(raw_cusip)
-                        if matched_cusip is None:
-                            continue
-                        extracted = True
-                        for ticker in cusip_to_tickers.get(matched_cusip, []):
-                            so = get_so(ticker, rep_str)
-                            row = {
-                                "group": group,
-                                "ticker": ticker,
-                                "mapped_cusip": ticker_to_cusip.get(ticker, ""),
-                                "filer_cik": cik_p,
-                                "form": form,
-                                "filing_date": f_date,
-                                "report_date": rep_str,
-                                "accession": acc,
-                                "info_table_url": url,
-                                "issuer_name": r.get("issuer_name", ""),
-                                "class_title": r.get("class_title", ""),
-                                "cusip": raw_cusip,
-                                "value_usd_thousands": r.get(
-                                    "value_usd_thousands", ""
-                                ),
-                                "shares_held": r.get("shares_held", ""),
-                                "shares_type": r.get("shares_type", ""),
-                                "put_call": r.get("put_call", ""),
-                                "investment_discretion": r.get(
-                                    "investment_discretion", ""
-                                ),
-                                "other_manager": r.get("other_manager", ""),
-                                "voting_sole": r.get("voting_sole", ""),
-                                "voting_shared": r.get("voting_shared", ""),
-                                "voting_none": r.get("voting_none", ""),
-                                "shares_outstanding": (
-                                    str(so) if so is not None else ""
-                                ),
-                            }
-                            raw_rows.append(row)
-                    if extracted:
-                        break
-                except Exception:
+                    sub_blob = archive_get(session, fsub_url)
+                    if len(sub_blob) < 500:
+                        continue  # Too small / error page
+                    matches = parse_pool.submit(
+                        match_full_submission_blob, sub_blob
+                    ).result()
+                except Exception as exc:
+                    res.errors.append(f"    ⚠ Fallback error on "
+                                      f"{fsub_url}: {exc}")
                     continue
+                if not matches:
+                    no_match_sizes.add(len(sub_blob))
+                if matches:
+                    res.matches = matches
+                    res.source_url = fsub_url
+                    res.via_full_submission = True
+                    break
 
-            # ── FALLBACK: parse full submission text file ──
-            # Old filings (pre-~2013) bundle domestic + international
-            # info tables as separate <DOCUMENT> sections within one
-            # big .txt file.  The scored candidates often only hit the
-            # international section.  parse_full_submission_text splits
-            # on <DOCUMENT> boundaries and searches each section for
-            # our target CUSIPs.
-            if not extracted:
-                # CRITICAL: the full submission text file is at the
-                # PARENT directory level, NOT inside the filing dir.
-                #   ✓ .../000136474210000027.txt   (parent level)
-                #   ✗ .../000136474210000027/0001364742-10-000027.txt
-                fsub_urls: List[str] = []
-                # 1) Parent-level full submission text
-                fsub_urls.append(base_url.rstrip("/") + ".txt")
-                # 2) Accession-named file inside directory (backup)
-                fsub_urls.append(urljoin(base_url, f"{acc}.txt"))
-                # 3) Any large .txt files from index.json
-                try:
-                    idx_j2 = sec_get(
-                        session, urljoin(base_url, "index.json")
-                    ).json()
-                    items2 = idx_j2.get("directory", {}).get("item", []) or []
-                    items2.sort(
-                        key=lambda x: int(x.get("size") or 0), reverse=True
-                    )
-                    for it2 in items2:
-                        n2 = (it2.get("name") or "").lower()
-                        sz2 = int(it2.get("size") or 0)
-                        if n2.endswith(".txt") and sz2 > 100_000:
-                            furl2 = urljoin(base_url, it2.get("name", ""))
-                            if furl2 not in fsub_urls:
-                                fsub_urls.append(furl2)
-                except Exception:
-                    pass
-
-                seen_fsub: Set[str] = set()
-                for fsub_url in fsub_urls:
-                    if extracted:
-                        break
-                    if fsub_url in seen_fsub:
-                        continue
-                    seen_fsub.add(fsub_url)
-                    try:
-                        sub_blob = sec_get(session, fsub_url).content
-                        if len(sub_blob) < 500:
-                            continue  # Too small / error page
-                        sub_rows = parse_full_submission_text(
-                            sub_blob, allowed_cusips
-                        )
-                        if not sub_rows:
-                            continue
-                        for r in sub_rows:
-                            raw_cusip = (
-                                (r.get("cusip") or "").strip().upper()
-                            )
-                            matched_cusip = match_cusip(raw_cusip)
-                            if matched_cusip is None:
-                                continue
-                            extracted = True
-                            for ticker in cusip_to_tickers.get(
-                                matched_cusip, []
-                            ):
-                                so = get_so(ticker, rep_str)
-                                raw_rows.append({
-                                    "group": group,
-                                    "ticker": ticker,
-                                    "mapped_cusip":
-                                        ticker_to_cusip.get(ticker, ""),
-                                    "filer_cik": cik_p,
-                                    "form": form,
-                                    "filing_date": f_date,
-                                    "report_date": rep_str,
-                                    "accession": acc,
-                                    "info_table_url": fsub_url,
-                                    "issuer_name":
-                                        r.get("issuer_name", ""),
-                                    "class_title":
-                                        r.get("class_title", ""),
-                                    "cusip": raw_cusip,
-                                    "value_usd_thousands": r.get(
-                                        "value_usd_thousands", ""
-                                    ),
-                                    "shares_held":
-                                        r.get("shares_held", ""),
-                                    "shares_type":
-                                        r.get("shares_type", ""),
-                                    "put_call":
-                                        r.get("put_call", ""),
-                                    "investment_discretion": r.get(
-                                        "investment_discretion", ""
-                                    ),
-                                    "other_manager":
-                                        r.get("other_manager", ""),
-                                    "voting_sole":
-                                        r.get("voting_sole", ""),
-                                    "voting_shared":
-                                        r.get("voting_shared", ""),
-                                    "voting_none":
-                                        r.get("voting_none", ""),
-                                    "shares_outstanding": (
-                                        str(so)
-                                        if so is not None else ""
-                                    ),
-                                })
-                        if extracted and verbose:
-                            fname = fsub_url.rsplit("/", 1)[-1]
-                            print(f"    ✓ Found domestic holdings "
-                                  f"via full submission: {fname}",
-                                  flush=True)
-                    except Exception as exc:
-                        if verbose and _diag_empty_count[0] < 3:
-                            print(f"    ⚠ Fallback error on "
-                                  f"{fsub_url}: {exc}",
-                                  flush=True)
-                        continue
+        return res
 
-            # Diagnostic: show details when a filing yields no matches
-            if not extracted and verbose and diag_total_parsed > 0:
-                if _diag_empty_count[0] < 5:
-                    _diag_empty_count[0] += 1
-                    print(f"    ⚠ {diag_total_parsed} holdings parsed but "
-                          f"0 CUSIP matches!", flush=True)
-                    print(f"      Sample CUSIPs in filing: "
-                          f"{diag_sample_cusips}", flush=True)
-                    print(f"      Our target CUSIPs: "
-                          f"{sorted(allowed_cusips)}", flush=True)
-                    # On first failure, dump full directory listing
-                    if _diag_empty_count[0] <= 2:
-                        try:
-                            idx_diag = sec_get(
-                                session, urljoin(base_url, "index.json")
-                            ).json()
-                            ditems = (idx_diag.get("directory", {})
-                                      .get("item", []) or [])
-                            def _safe_size(x):
-                                try:
-                                    return int(x.get("size", 0))
-                                except (ValueError, TypeError):
-                                    return 0
-                            ditems_sorted = sorted(
-                                ditems, key=_safe_size, reverse=True
-                            )[:15]
-                            print(f"      Directory ({len(ditems)} files):",
-                                  flush=True)
-                            for di in ditems_sorted:
-                                sz = str(di.get('size', '?'))
-                                print(f"        {di.get('name','?'):45s} "
-                                      f"size={sz:>12s}",
-                                      flush=True)
-                        except Exception:
-                            pass
-            elif not extracted and verbose and diag_total_parsed == 0:
-                if _diag_empty_count[0] < 5:
-                    _diag_empty_count[0] += 1
-                    top_url = urls[0] if urls else "?"
-                    print(f"    ⚠ 0 holdings parsed from "
-                          f"{len(urls)} candidate file(s)", flush=True)
-                    print(f"      Top candidate: {top_url}", flush=True)
-
-            # Show first 3 successful extractions for data verification
-            if extracted and verbose and _diag_success_count[0] < 3:
-                _diag_success_count[0] += 1
-                # Gather what was just extracted for this filing
-                filing_rows = [r for r in raw_rows
-                               if r.get("accession") == acc
-                               and r.get("filer_cik") == cik_p]
-                for fr in filing_rows:
-                    print(f"    📊 {fr['ticker']}: "
-                          f"shares={fr['shares_held']:>12s}  "
-                          f"value=${fr['value_usd_thousands']}k  "
-                          f"SO={fr.get('shares_outstanding','?')}",
-                          flush=True)
+    panel_by_group: Dict[str, List[Dict[str, Any]]] = {}
 
-            time.sleep(args.sleep)
+    # One bounded, ordered stream of results across all groups, so the
+    # next group's filings are already downloading while this one is
+    # being consolidated and written.
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                             mp_context=_PARSE_MP_CONTEXT,
+                             initializer=_init_parse_worker,
+                             initargs=(match_cusip,)) as parse_pool, \
+         ThreadPoolExecutor(max_workers=FILING_FETCH_WORKERS) as fetch_pool:
+        results = iter_bounded(
+            fetch_pool, fetch_filing,
+            (e for g in group_ciks for e in entries_by_group.get(g, [])),
+            window=FILING_PIPELINE_DEPTH,
+        )
 
-        raw_deduped = dedupe_raw(raw_rows)
+        for group in group_ciks:
+            if verbose:
+                print(f"\n{'='*60}", flush=True)
+                print(f"  {group}  ({len(entries_by_group.get(group, []))} filings "
+                      f"from {len(group_ciks[group])} CIK(s))", flush=True)
+                print(f"{'='*60}", flush=True)
+
+            filings = entries_by_group.get(group, [])
+            raw_rows: List[Dict[str, Any]] = []
+            _diag_empty_count = [0]  # mutable counter for diagnostic limiting
+            _diag_success_count = [0]  # first N successful extractions shown
+
+            for i, res in enumerate(itertools.islice(results, len(filings)), 1):
+                if res.skipped:
+                    continue
+                cik_p  = res.entry["cik"]
+                form   = res.entry["form"]
+                acc    = res.entry["accession"]
+                f_date = res.entry["filing_date"]
+                base_url = res.base_url
+                rep_str  = res.rep_str
+                rep_d = parse_date(rep_str)
+                urls = res.urls
+
+                if verbose:
+                    print(f"  [{i}/{len(filings)}] {form} filed {f_date} "
+                          f"report {rep_str or '???'} CIK {cik_p}", flush=True)
+
+                if not urls:
+                    if verbose and rep_d and rep_d.year <= 2013:
+                        print(f"    ⚠ No info table URLs found at {base_url}",
+                              flush=True)
+                    continue
 
-        if verbose:
-            dates = [parse_date(r.get("report_date")) for r in raw_deduped]
-            dates = [d for d in dates if d]
-            if dates:
-                print(f"  Date range: {min(dates)} -> {max(dates)}", flush=True)
-            print(f"  Rows (raw={len(raw_rows)}, deduped={len(raw_deduped)})",
-                  flush=True)
+                if verbose:
+                    for msg in res.errors:
+                        if _diag_empty_count[0] < 3:
+                            print(msg, flush=True)
+
+                extracted = bool(res.matches)
+                diag_total_parsed = res.total_parsed
+                diag_sample_cusips = res.sample_cusips
+
+                # Kept rows live until the end of the run, and every string in
+                # them arrived as a fresh object from a worker's pickle.  Intern
+                # the ones that repeat across filings (CUSIPs, issuer names,
+                # dates, codes) so the raw table holds one copy of each.
+                intern = sys.intern
+                filer, form_i = intern(cik_p), intern(form)
+                f_date_i, rep_i = intern(f_date), intern(rep_str)
+                filing_rows: List[Dict[str, Any]] = []
+                for raw_cusip, matched_cusip, r in res.matches:
+                    for ticker in cusip_to_tickers.get(matched_cusip, []):
+                        so = get_so(ticker, rep_str)
+                        filing_rows.append({
+                            "group": group,
+                            "ticker": ticker,
+                            "mapped_cusip": ticker_to_cusip.get(ticker, ""),
+                            "filer_cik": filer,
+                            "form": form_i,
+                            "filing_date": f_date_i,
+                            "report_date": rep_i,
+                            "accession": acc,
+                            "info_table_url": res.source_url,
+                            "issuer_name": intern(r.get("issuer_name", "")),
+                            "class_title": intern(r.get("class_title", "")),
+                            "cusip": intern(raw_cusip),
+                            "value_usd_thousands": r.get(
+                                "value_usd_thousands", ""
+                            ),
+                            "shares_held": r.get("shares_held", ""),
+                            "shares_type": intern(r.get("shares_type", "")),
+                            "put_call": intern(r.get("put_call", "")),
+                            "investment_discretion": intern(r.get(
+                                "investment_discretion", ""
+                            )),
+                            "other_manager": intern(r.get("other_manager", "")),
+                            "voting_sole": r.get("voting_sole", ""),
+                            "voting_shared": r.get("voting_shared", ""),
+                            "voting_none": r.get("voting_none", ""),
+                            "shares_outstanding": (
+                                intern(str(so)) if so is not None else ""
+                            ),
+                        })
+                raw_rows.extend(filing_rows)
+
+                if res.via_full_submission and verbose:
+                    fname = res.source_url.rsplit("/", 1)[-1]
+                    print(f"    ✓ Found domestic holdings "
+                          f"via full submission: {fname}",
+                          flush=True)
 
-        if want_panel:
-            panel = build_panel(group, raw_deduped)
-            path = os.path.join(out_dir, f"{group}_13f_holdings_panel.csv")
-            write_csv(path, PANEL_COLUMNS, panel)
+                # Diagnostic: show details when a filing yields no matches
+                if not extracted and verbose and diag_total_parsed > 0:
+                    if _diag_empty_count[0] < 5:
+                        _diag_empty_count[0] += 1
+                        print(f"    ⚠ {diag_total_parsed} holdings parsed but "
+                              f"0 CUSIP matches!", flush=True)
+                        print(f"      Sample CUSIPs in filing: "
+                              f"{diag_sample_cusips}", flush=True)
+                        print(f"      Our target CUSIPs: "
+                              f"{sorted(allowed_cusips)}", flush=True)
+                        # On first failure, dump full directory listing
+                        if _diag_empty_count[0] <= 2:
+                            try:
+                                ditems = _filing_index_items(session,
+                                                             base_url)
+                                def _safe_size(x):
+                                    try:
+                                        return int(x.get("size", 0))
+                                    except (ValueError, TypeError):
+                                        return 0
+                                ditems_sorted = sorted(
+                                    ditems, key=_safe_size, reverse=True
+                                )[:15]
+                                print(f"      Directory ({len(ditems)} files):",
+                                      flush=True)
+                                for di in ditems_sorted:
+                                    sz = str(di.get('size', '?'))
+                                    print(f"        {di.get('name','?'):45s} "
+                                          f"size={sz:>12s}",
+                                          flush=True)
+                            except Exception:
+                                pass
+                elif not extracted and verbose and diag_total_parsed == 0:
+                    if _diag_empty_count[0] < 5:
+                        _diag_empty_count[0] += 1
+                        top_url = urls[0] if urls else "?"
+                        print(f"    ⚠ 0 holdings parsed from "
+                              f"{len(urls)} candidate file(s)", flush=True)
+                        print(f"      Top candidate: {top_url}", flush=True)
+
+                # Show first 3 successful extractions for data verification
+                if extracted and verbose and _diag_success_count[0] < 3:
+                    _diag_success_count[0] += 1
+                    for fr in filing_rows:
+                        print(f"    📊 {fr['ticker']}: "
+                              f"shares={fr['shares_held']:>12s}  "
+                              f"value=${fr['value_usd_thousands']}k  "
+                              f"SO={fr.get('shares_outstanding','?')}",
+                              flush=True)
+
+            raw_deduped = dedupe_raw(raw_rows)
+            # Rows superseded by an amendment can go now; the next group's
+            # filings are already streaming in.
+            n_raw = len(raw_rows)
+            del raw_rows
 
-            # Diagnostic: show first 3 and last 3 panel rows per ticker
-            if verbose:
-                by_tk: Dict[str, list] = defaultdict(list)
-                for pr in panel:
-                    by_tk[pr.get("ticker", "")].append(pr)
-                for tk in sorted(by_tk):
-                    tkrows = sorted(by_tk[tk],
-                                    key=lambda r: r.get("report_date", ""))
-                    sample = tkrows[:2] + (["..."] if len(tkrows) > 4 else []) + tkrows[-2:]
-                    for sr in sample:
-                        if sr == "...":
-                            print(f"    {tk}: ...", flush=True)
-                        else:
-                            sh = sr.get("shares_held", 0)
-                            so = sr.get("shares_outstanding", "?")
-                            rd = sr.get("report_date", "?")
-                            note = sr.get("consolidation_note", "")
-                            print(f"    {tk} {rd}: shares_held={sh:>14,}  "
-                                  f"SO={so:>14s}  {note}",
-                                  flush=True)
-            write_csv(path, PANEL_COLUMNS, panel)
-            panel_by_group[group] = panel
-            if verbose:
-                print(f"  -> Wrote PANEL: {path} ({len(panel)} rows)", flush=True)
-        else:
-            path = os.path.join(out_dir, f"{group}_13f_holdings_raw.csv")
-            write_csv(path, RAW_COLUMNS, raw_deduped)
             if verbose:
-                print(f"  -> Wrote RAW: {path} ({len(raw_deduped)} rows)",
+                # A few dozen distinct quarter-ends, however many rows
+                dates = [parse_date(rd) for rd in
+                         {r.get("report_date") for r in raw_deduped}]
+                dates = [d for d in dates if d]
+                if dates:
+                    print(f"  Date range: {min(dates)} -> {max(dates)}", flush=True)
+                print(f"  Rows (raw={n_raw}, deduped={len(raw_deduped)})",
                       flush=True)
 
+            if want_panel:
+                panel = build_panel(group, raw_deduped)
+                path = write_table(os.path.join(out_dir, f"{group}_13f_holdings_panel.csv"),
+                                   PANEL_COLUMNS, panel, args.format)
+
+                # Diagnostic: show first 3 and last 3 panel rows per ticker
+                if verbose:
+                    # build_panel emits rows grouped by ticker, in ticker order
+                    for tk, tkgroup in itertools.groupby(
+                            panel, key=lambda r: r.get("ticker", "")):
+                        tkrows = sorted(tkgroup,
+                                        key=lambda r: r.get("report_date", ""))
+                        sample = tkrows[:2] + (["..."] if len(tkrows) > 4 else []) + tkrows[-2:]
+                        for sr in sample:
+                            if sr == "...":
+                                print(f"    {tk}: ...", flush=True)
+                            else:
+                                sh = sr.get("shares_held", 0)
+                                so = sr.get("shares_outstanding", "?")
+                                rd = sr.get("report_date", "?")
+                                note = sr.get("consolidation_note", "")
+                                print(f"    {tk} {rd}: shares_held={sh:>14,}  "
+                                      f"SO={so:>14s}  {note}",
+                                      flush=True)
+                panel_by_group[group] = panel
+                if verbose:
+                    print(f"  -> Wrote PANEL: {path} ({len(panel)} rows)", flush=True)
+            else:
+                path = write_table(os.path.join(out_dir, f"{group}_13f_holdings_raw.csv"),
+                                   RAW_COLUMNS, raw_deduped, args.format)
+                if verbose:
+                    print(f"  -> Wrote RAW: {path} ({len(raw_deduped)} rows)",
+                          flush=True)
+            # Written out: don't hold this group's rows through the next
+            # group's whole fetch loop.
+            del raw_deduped
+
     # ── BVS + chart ──
     if want_panel:
         bvs = build_bvs(panel_by_group)
-        bvs_path = os.path.join(out_dir, "BVS_13f_holdings_panel.csv")
-        write_csv(bvs_path, BVS_COLUMNS, bvs)
+        bvs_path = write_table(os.path.join(out_dir, "BVS_13f_holdings_panel.csv"),
+                               BVS_COLUMNS, bvs, args.format)
         if verbose:
             print(f"\n  -> Wrote BVS: {bvs_path} ({len(bvs)} rows)", flush=True)
 
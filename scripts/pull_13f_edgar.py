@@ -7,18 +7,36 @@ Run:
 from __future__ import annotations
 
 import argparse
+import bisect
 import csv
 import datetime as dt
+import functools
+import gzip
+import io
+import itertools
+import json
 import os
+import random
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Set
-from urllib.parse import urljoin
+from typing import IO, Any, Dict, Iterable, List, Optional, Tuple, Set, Union
 
 import requests
 import xml.etree.ElementTree as ET
 
+try:
+    from lxml import etree as LET   # optional: faster streaming XML parse
+except ImportError:
+    LET = None
+
+try:
+    import orjson                   # optional: faster JSON decode
+except ImportError:
+    orjson = None
+
 SEC_DATA_BASE = "https://data.sec.gov/"
 SEC_ARCHIVES_BASE = "https://www.sec.gov/Archives/"
 SEC_COMPANY_TICKERS = "https://www.sec.gov/files/company_tickers.json"
@@ -28,6 +46,20 @@ DEFAULT_START_DATE = "2010-01-01"
 DEFAULT_MIN_REPORT_DATE = "2009-12-31"
 FORMS = {"13F-HR", "13F-HR/A"}
 
+# SEC fair-access limit is 10 requests/s; stay just under it.  Filings are
+# fetched by a small thread pool and every request waits on one shared
+# token bucket, so the pool overlaps round trips without exceeding the cap.
+SEC_MAX_REQUESTS_PER_SEC = 9
+FETCH_WORKERS = 8
+
+# Submissions, companyfacts and company_tickers JSON are cached under
+# --cache-dir.  Within these ages a cached copy is used as is; after that it
+# is revalidated with If-None-Match / If-Modified-Since, and a 304 keeps the
+# cached body.
+SUBMISSIONS_MAX_AGE_SECONDS = 24 * 3600
+COMPANY_FACTS_MAX_AGE_SECONDS = 6 * 3600
+COMPANY_TICKERS_MAX_AGE_SECONDS = 24 * 3600
+
 GROUPS: Dict[str, Dict[str, Any]] = {
     "BlackRock": {"seed_ciks": ["0001364742", "0000913414"], "keywords": ["blackrock"]},
     "Vanguard": {"seed_ciks": ["0000102909", "0000862084"], "keywords": ["vanguard"]},
@@ -87,22 +119,29 @@ class Filing:
     report_date: Optional[str]
     primary_doc: Optional[str]
 
+_RE_NON_DIGIT = re.compile(r"\D")
+
 def pad_cik(cik: str) -> str:
-    return re.sub(r"\D", "", cik).zfill(10)
+    return _RE_NON_DIGIT.sub("", cik).zfill(10)
 
 def cik_int_str(cik: str) -> str:
-    return str(int(re.sub(r"\D", "", cik)))
+    return str(int(_RE_NON_DIGIT.sub("", cik)))
 
 def accession_nodash(acc: str) -> str:
     return acc.replace("-", "")
 
+_RE_DATE8 = re.compile(r"\d{8}")
+
+# Called from every sort key and dedupe comparison on a few hundred distinct
+# date strings; typed=True keeps e.g. 20100331 and 20100331.0 apart.
+@functools.lru_cache(maxsize=8192, typed=True)
 def parse_iso_date_or_none(s: Any) -> Optional[dt.date]:
     if s is None:
         return None
     x = str(s).strip()
     if not x:
         return None
-    if re.fullmatch(r"\d{8}", x):
+    if _RE_DATE8.fullmatch(x):
         try:
             return dt.date(int(x[0:4]), int(x[4:6]), int(x[6:8]))
         except Exception:
@@ -112,14 +151,26 @@ def parse_iso_date_or_none(s: Any) -> Optional[dt.date]:
     except Exception:
         return None
 
+@functools.lru_cache(maxsize=8192, typed=True)
 def normalize_report_date_str(s: Any) -> str:
     d = parse_iso_date_or_none(s)
     return d.isoformat() if d else ""
 
 def safe_int(s: Any) -> int:
-    if s is None:
+    # Fast paths for what the aggregation passes actually see: plain digit
+    # strings from the XML (isdecimal() accepts exactly what int() does),
+    # running int totals, and empty cells.
+    t = type(s)
+    if t is str:
+        if s.isdecimal():
+            return int(s)
+        if not s:
+            return 0
+    elif t is int:
+        return s
+    elif s is None:
         return 0
-    if isinstance(s, int):
+    elif isinstance(s, int):
         return s
     x = str(s).strip()
     if not x:
@@ -129,44 +180,144 @@ def safe_int(s: Any) -> int:
     except Exception:
         return 0
 
-def sec_get(session: requests.Session, url: str, retries: int = 12, timeout: int = 60) -> requests.Response:
+class RateLimiter:
+    # Holds at most `capacity` tokens.  The default of 1 spaces requests
+    # evenly; a bucket of `rate` tokens would let the fetch workers spend it
+    # on top of the refill after any pause, ~2x the rate in one second.
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+
+SEC_LIMITER = RateLimiter(SEC_MAX_REQUESTS_PER_SEC)
+
+def build_session(user_agent: str) -> requests.Session:
+    session = requests.Session()
+    session.headers.update({"User-Agent": user_agent, "Accept-Encoding": "gzip, deflate"})
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_WORKERS)
+    session.mount("https://", adapter)
+    return session
+
+def sec_get(session: requests.Session, url: str, retries: int = 12, timeout: int = 60,
+            headers: Optional[Dict[str, str]] = None, stream: bool = False) -> requests.Response:
+    # With stream=True the caller reads (and must close) the returned body.
     backoff = 1.0
     last = None
     for _ in range(retries):
-        r = session.get(url, timeout=timeout)
+        SEC_LIMITER.acquire()
+        r = session.get(url, timeout=timeout, headers=headers, stream=stream)
         last = r
-        if r.status_code == 200:
+        if r.status_code == 200 or (r.status_code == 304 and headers):
             return r
-        if r.status_code in (429, 500, 502, 503, 504):
-            time.sleep(backoff)
+        # SEC's rate limiter answers 403 "Request Rate Threshold Exceeded"
+        # as well as 429; both clear after a pause.
+        if r.status_code in (429, 500, 502, 503, 504) or (
+                r.status_code == 403 and "Request Rate Threshold" in r.text):
+            # Honour Retry-After; otherwise jitter the backoff so the fetch
+            # workers don't all retry in lockstep.
+            ra = (r.headers.get("Retry-After") or "").strip()
+            wait = float(ra) if ra.isdigit() else backoff * random.uniform(0.5, 1.5)
+            r.close()
+            time.sleep(wait)
             backoff = min(backoff * 2.0, 90.0)
             continue
         raise RuntimeError(f"GET {url} failed: {r.status_code} {r.text[:200]}")
     raise RuntimeError(f"GET {url} failed after retries: {getattr(last,'status_code',None)}")
 
+def _json_bytes(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+_JSON_CACHE_DIR: Optional[str] = None
+_RE_CACHE_UNSAFE = re.compile(r"[^A-Za-z0-9._-]")
+
+def set_json_cache_dir(cache_dir: Optional[str]) -> None:
+    global _JSON_CACHE_DIR
+    _JSON_CACHE_DIR = cache_dir
+
+def _write_atomic(path: str, data: bytes, compress: bool = False) -> None:
+    # Per-thread temp name: fetch workers may write the same entry at once.
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with (gzip.open(tmp, "wb", compresslevel=3) if compress else open(tmp, "wb")) as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+def sec_get_json(session: requests.Session, url: str, max_age: float) -> Any:
+    if _JSON_CACHE_DIR is None:
+        return _json_bytes(sec_get(session, url).content)
+    base = os.path.join(_JSON_CACHE_DIR, _RE_CACHE_UNSAFE.sub("_", url.split("://", 1)[-1]))
+    gz_path, meta_path = base + ".gz", base + ".meta.json"
+
+    def read_cache() -> Optional[Any]:
+        try:
+            with gzip.open(gz_path, "rb") as f:
+                return _json_bytes(f.read())
+        except (OSError, EOFError, ValueError):
+            return None
+
+    meta: Dict[str, Any] = {}
+    if os.path.exists(gz_path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+    if meta and time.time() - float(meta.get("fetched") or 0) < max_age:
+        data = read_cache()
+        if data is not None:
+            return data
+
+    headers: Dict[str, str] = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    r = sec_get(session, url, headers=headers or None)
+    data = read_cache() if r.status_code == 304 else None
+    if data is None:
+        if r.status_code == 304:
+            r = sec_get(session, url)
+        raw = r.content
+        data = _json_bytes(raw)
+        os.makedirs(_JSON_CACHE_DIR, exist_ok=True)
+        _write_atomic(gz_path, raw, compress=True)
+        meta = {"etag": r.headers.get("ETag", ""), "last_modified": r.headers.get("Last-Modified", "")}
+    meta["fetched"] = time.time()
+    _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    return data
+
 def fetch_submissions(session: requests.Session, cik: str) -> Dict[str, Any]:
-    url = urljoin(SEC_DATA_BASE, f"submissions/CIK{pad_cik(cik)}.json")
-    return sec_get(session, url).json()
+    url = f"{SEC_DATA_BASE}submissions/CIK{pad_cik(cik)}.json"
+    return sec_get_json(session, url, SUBMISSIONS_MAX_AGE_SECONDS)
 
 def fetch_submissions_file(session: requests.Session, name: str) -> Dict[str, Any]:
-    url = urljoin(SEC_DATA_BASE, f"submissions/{name}")
-    return sec_get(session, url).json()
+    url = f"{SEC_DATA_BASE}submissions/{name}"
+    return sec_get_json(session, url, SUBMISSIONS_MAX_AGE_SECONDS)
 
 def rows_from_columnar(col: Dict[str, Any]) -> List[Dict[str, Any]]:
     forms = col.get("form", [])
     if not isinstance(forms, list):
         return []
-    n = len(forms)
-    out = []
-    for i in range(n):
-        out.append({
-            "form": col.get("form", [None])[i],
-            "accessionNumber": col.get("accessionNumber", [None])[i],
-            "filingDate": col.get("filingDate", [None])[i],
-            "reportDate": col.get("reportDate", [None])[i],
-            "primaryDocument": col.get("primaryDocument", [None])[i],
-        })
-    return out
+    # One pass over the parallel arrays; a missing or short array reads as None.
+    cols = itertools.zip_longest(forms, col.get("accessionNumber") or [], col.get("filingDate") or [],
+                                 col.get("reportDate") or [], col.get("primaryDocument") or [])
+    return [
+        {"form": f, "accessionNumber": a, "filingDate": fd, "reportDate": rd, "primaryDocument": pd}
+        for f, a, fd, rd, pd in itertools.islice(cols, len(forms))
+    ]
 
 def normalize_submission_payload(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     filings = payload.get("filings")
@@ -195,7 +346,6 @@ def iter_filing_rows(sub: Dict[str, Any], session: requests.Session) -> List[Dic
             rows.extend(normalize_submission_payload(older))
         except Exception:
             pass
-        time.sleep(0.15)
     return rows
 
 def has_any_13f_in_recent(sub: Dict[str, Any]) -> bool:
@@ -204,7 +354,36 @@ def has_any_13f_in_recent(sub: Dict[str, Any]) -> bool:
     return any((f or "").strip() in FORMS for f in forms)
 
 def filing_base_dir(f: Filing) -> str:
-    return urljoin(SEC_ARCHIVES_BASE, f"edgar/data/{f.cik_int}/{accession_nodash(f.accession)}/")
+    # Always ends in "/", so document URLs are plain base + name.
+    return f"{SEC_ARCHIVES_BASE}edgar/data/{f.cik_int}/{accession_nodash(f.accession)}/"
+
+_RE_REPORT_CAL = re.compile(rb"<reportCalendarOrQuarter>\s*([0-9]{4}-[0-9]{2}-[0-9]{2})\s*</reportCalendarOrQuarter>", re.I)
+_RE_CONFORMED_PERIOD = re.compile(rb"CONFORMED\s+PERIOD\s+OF\s+REPORT:\s*([0-9]{8})", re.I)
+
+def _search_from(content: bytes, lowered: bytes, needle: bytes, rx: "re.Pattern[bytes]") -> Optional["re.Match[bytes]"]:
+    # Same result as rx.search(content) for a case-insensitive rx whose
+    # match must start with `needle`: memchr-speed find() on the lower-cased
+    # copy, then the regex only at those offsets.
+    i = lowered.find(needle)
+    while i >= 0:
+        m = rx.match(content, i)
+        if m:
+            return m
+        i = lowered.find(needle, i + 1)
+    return None
+
+def report_date_from_primary(content: bytes) -> Optional[str]:
+    """reportCalendarOrQuarter, else CONFORMED PERIOD OF REPORT (ISO, or ""
+    when that date is invalid); None when the document has neither."""
+    lowered = content.lower()
+    m = _search_from(content, lowered, b"<reportcalendarorquarter>", _RE_REPORT_CAL)
+    if m:
+        return m.group(1).decode("ascii")
+    m = _search_from(content, lowered, b"conformed", _RE_CONFORMED_PERIOD)
+    if m:
+        d = parse_iso_date_or_none(m.group(1).decode("ascii"))
+        return d.isoformat() if d else ""
+    return None
 
 def infer_report_date_from_primary(session: requests.Session, filing: Filing) -> str:
     base = filing_base_dir(filing)
@@ -218,22 +397,18 @@ def infer_report_date_from_primary(session: requests.Session, filing: Filing) ->
             continue
         seen.add(name)
         try:
-            content = sec_get(session, urljoin(base, name), timeout=45).content
+            content = sec_get(session, base + name, timeout=45).content
         except Exception:
             continue
-        text = content.decode("utf-8", errors="ignore")
-        m = re.search(r"<reportCalendarOrQuarter>\s*([0-9]{4}-[0-9]{2}-[0-9]{2})\s*</reportCalendarOrQuarter>", text, flags=re.I)
-        if m:
-            return m.group(1)
-        m = re.search(r"CONFORMED\s+PERIOD\s+OF\s+REPORT:\s*([0-9]{8})", text, flags=re.I)
-        if m:
-            d = parse_iso_date_or_none(m.group(1))
-            return d.isoformat() if d else ""
+        rep = report_date_from_primary(content)
+        if rep is not None:
+            return rep
     return ""
 
 def get_13f_filings_for_cik(session: requests.Session, group: str, cik: str, start_filing_date: dt.date) -> List[Filing]:
     sub = fetch_submissions(session, cik)
     rows = iter_filing_rows(sub, session)
+    cik_p, cik_i = pad_cik(cik), cik_int_str(cik)
     out: List[Filing] = []
     for r in rows:
         form = (r.get("form") or "").strip()
@@ -248,8 +423,8 @@ def get_13f_filings_for_cik(session: requests.Session, group: str, cik: str, sta
             continue
         out.append(Filing(
             group=group,
-            cik=pad_cik(cik),
-            cik_int=cik_int_str(cik),
+            cik=cik_p,
+            cik_int=cik_i,
             form=form,
             accession=accession,
             filing_date=str(filing_date),
@@ -261,7 +436,7 @@ def get_13f_filings_for_cik(session: requests.Session, group: str, cik: str, sta
 
 def list_filing_directory_items(session: requests.Session, filing: Filing) -> Tuple[str, List[Dict[str, Any]]]:
     base = filing_base_dir(filing)
-    idx = sec_get(session, urljoin(base, "index.json")).json()
+    idx = _json_bytes(sec_get(session, base + "index.json").content)
     items = idx.get("directory", {}).get("item", []) or []
     return base, items
 
@@ -284,49 +459,90 @@ def find_info_table_url(session: requests.Session, filing: Filing) -> Optional[s
         preferred = [c for c in candidates if kw in c[1]]
         if preferred:
             preferred.sort(key=lambda x: (-x[2], len(x[0]), x[0]))
-            return urljoin(base, preferred[0][0])
+            return base + preferred[0][0]
     candidates.sort(key=lambda x: (-x[2], len(x[0]), x[0]))
-    return urljoin(base, candidates[0][0])
+    return base + candidates[0][0]
 
 def strip_ns(tag: str) -> str:
     return tag.split("}", 1)[-1] if "}" in tag else tag
 
-def parse_info_table_xml(xml_bytes: bytes) -> List[Dict[str, Any]]:
-    root = ET.fromstring(xml_bytes)
-    out: List[Dict[str, Any]] = []
-    for el in root.iter():
-        if strip_ns(el.tag) != "infoTable":
-            continue
+def _iter_info_tables(source: Union[bytes, IO[bytes]]):
+    f = io.BytesIO(source) if isinstance(source, bytes) else source
+    if LET is None:
+        root = ET.parse(f).getroot()
+        for el in root.iter():
+            if strip_ns(el.tag) == "infoTable":
+                yield el
+        return
+    # Stream rows and drop each one (and its already-handled siblings) once
+    # it has been read, instead of building the whole tree first.
+    for _, el in LET.iterparse(f, events=("end",), tag="{*}infoTable",
+                               huge_tree=True, remove_comments=True, remove_pis=True):
+        yield el
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+
+# One pass over an element's children (lxml builds a proxy object per child
+# visited, so re-scanning for each field is what costs).  The first child
+# with a tag wins, except these two where the last one always did.
+_LAST_CHILD_WINS = ("shrsOrPrnAmt", "votingAuthority")
+
+# Qualified tag -> local name.  An info table uses a dozen distinct tags, so
+# this stays tiny and replaces a string split per child with a dict hit.
+_LOCAL_NAMES: Dict[str, str] = {}
+
+def child_map(parent) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    local = _LOCAL_NAMES
+    for ch in parent:
+        tag = ch.tag
+        name = local.get(tag)
+        if name is None:
+            name = local[tag] = strip_ns(tag)
+        if name not in out or name in _LAST_CHILD_WINS:
+            out[name] = ch
+    return out
 
-        def child_text(parent, name: str) -> Optional[str]:
-            for ch in parent:
-                if strip_ns(ch.tag) == name:
-                    return (ch.text or "").strip()
-            return None
+def child_text(kids: Dict[str, Any], name: str) -> Optional[str]:
+    ch = kids.get(name)
+    return (ch.text or "").strip() if ch is not None else None
 
+def parse_info_table_xml(source: Union[bytes, IO[bytes]], allowed_cusips: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    # `source` is the document bytes or a binary stream (e.g. a response
+    # body).  With allowed_cusips, holdings in other CUSIPs (nearly all of a
+    # large filer's table) are skipped before the rest of the row is read.
+    out: List[Dict[str, Any]] = []
+    for el in _iter_info_tables(source):
+        kids = child_map(el)
+        cusip = child_text(kids, "cusip") or ""
+        if allowed_cusips is not None and cusip not in allowed_cusips:
+            continue
         row: Dict[str, Any] = {
-            "issuer_name": child_text(el, "nameOfIssuer") or "",
-            "class_title": child_text(el, "titleOfClass") or "",
-            "cusip": child_text(el, "cusip") or "",
-            "value_usd_thousands": child_text(el, "value") or "",
-            "put_call": child_text(el, "putCall") or "",
-            "investment_discretion": child_text(el, "investmentDiscretion") or "",
-            "other_manager": child_text(el, "otherManager") or "",
+            "issuer_name": child_text(kids, "nameOfIssuer") or "",
+            "class_title": child_text(kids, "titleOfClass") or "",
+            "cusip": cusip,
+            "value_usd_thousands": child_text(kids, "value") or "",
+            "put_call": child_text(kids, "putCall") or "",
+            "investment_discretion": child_text(kids, "investmentDiscretion") or "",
+            "other_manager": child_text(kids, "otherManager") or "",
             "shares_or_principal": "",
             "shares_or_principal_type": "",
             "voting_sole": "",
             "voting_shared": "",
             "voting_none": "",
         }
-        for ch in el:
-            if strip_ns(ch.tag) == "shrsOrPrnAmt":
-                row["shares_or_principal"] = child_text(ch, "sshPrnamt") or ""
-                row["shares_or_principal_type"] = child_text(ch, "sshPrnamtType") or ""
-        for ch in el:
-            if strip_ns(ch.tag) == "votingAuthority":
-                row["voting_sole"] = child_text(ch, "Sole") or ""
-                row["voting_shared"] = child_text(ch, "Shared") or ""
-                row["voting_none"] = child_text(ch, "None") or ""
+        shrs = kids.get("shrsOrPrnAmt")
+        if shrs is not None:
+            sub = child_map(shrs)
+            row["shares_or_principal"] = child_text(sub, "sshPrnamt") or ""
+            row["shares_or_principal_type"] = child_text(sub, "sshPrnamtType") or ""
+        vote = kids.get("votingAuthority")
+        if vote is not None:
+            sub = child_map(vote)
+            row["voting_sole"] = child_text(sub, "Sole") or ""
+            row["voting_shared"] = child_text(sub, "Shared") or ""
+            row["voting_none"] = child_text(sub, "None") or ""
         out.append(row)
     return out
 
@@ -348,14 +564,12 @@ def load_ticker_to_cusip_map(path: str) -> Dict[str, str]:
                 m[t] = c
     return m
 
-def build_ticker_to_issuer_cik(session: requests.Session, verbose: bool) -> Dict[str, str]:
-    if verbose:
-        print("Downloading SEC company_tickers.json (this can take ~5-20s)…", flush=True)
-    data = sec_get(session, SEC_COMPANY_TICKERS).json()
-    if verbose:
-        print("Loaded company_tickers.json.", flush=True)
+def fetch_company_tickers(session: requests.Session) -> Dict[str, Any]:
+    return sec_get_json(session, SEC_COMPANY_TICKERS, COMPANY_TICKERS_MAX_AGE_SECONDS)
+
+def build_ticker_to_issuer_cik(companies: Dict[str, Any]) -> Dict[str, str]:
     mapping: Dict[str, str] = {}
-    for _, row in data.items():
+    for _, row in companies.items():
         t = (row.get("ticker") or "").strip().upper()
         c = str(row.get("cik_str") or "").strip()
         if t and c:
@@ -370,7 +584,7 @@ def _extract_shares_outstanding_units(facts_block: Dict[str, Any]) -> List[Dict[
 
 def fetch_shares_outstanding_series(session: requests.Session, issuer_cik_padded: str) -> List[Tuple[dt.date, int]]:
     url = SEC_COMPANY_FACTS.format(cik=issuer_cik_padded)
-    data = sec_get(session, url).json()
+    data = sec_get_json(session, url, COMPANY_FACTS_MAX_AGE_SECONDS)
     facts = data.get("facts") or {}
     dei = facts.get("dei") or {}
     usg = facts.get("us-gaap") or {}
@@ -389,37 +603,49 @@ def fetch_shares_outstanding_series(session: requests.Session, issuer_cik_padded
     out.sort(key=lambda x: x[0])
     return out
 
-def pick_shares_outstanding(series: List[Tuple[dt.date, int]], report_date: dt.date) -> Optional[int]:
-    if not series:
-        return None
-    for end, val in reversed(series):
-        if end == report_date:
-            return val
-    cutoff = report_date - dt.timedelta(days=120)
-    candidates = [(end, val) for (end, val) in series if cutoff <= end <= report_date]
-    if candidates:
-        candidates.sort(key=lambda x: x[0])
-        return candidates[-1][1]
+# A fetched series split into parallel (end dates, values) lists, both in
+# end-date order, so lookups can bisect the dates.
+SharesSeries = Tuple[List[dt.date], List[int]]
+
+def split_shares_series(series: List[Tuple[dt.date, int]]) -> SharesSeries:
+    return [end for end, _ in series], [val for _, val in series]
+
+def pick_shares_outstanding(series: SharesSeries, report_date: dt.date) -> Optional[int]:
+    # Latest value dated on or before report_date, at most 120 days old; an
+    # exact match is just the zero-day case.  Among equal dates the last
+    # one in the series wins.
+    ends, vals = series
+    i = bisect.bisect_right(ends, report_date) - 1
+    if i >= 0 and ends[i] >= report_date - dt.timedelta(days=120):
+        return vals[i]
     return None
 
-def write_csv(path: str, cols: List[str], rows: List[Dict[str, Any]]) -> None:
+def write_csv(path: str, cols: List[str], rows: Iterable[Dict[str, Any]]) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=cols, extrasaction="ignore")
-        w.writeheader()
-        for r in rows:
-            w.writerow({k: r.get(k, "") for k in cols})
+        w = csv.writer(f)
+        w.writerow(cols)
+        w.writerows([r.get(k, "") for k in cols] for r in rows)
+
+# Raw rows built in main() carry their parsed dates as "_report_date_d" /
+# "_filing_date_d" (None when unparseable); write_csv only emits the named
+# columns, so the helpers below read those and parse only as a fallback.
+def _report_date_d(r: Dict[str, Any]) -> Optional[dt.date]:
+    return r.get("_report_date_d") or parse_iso_date_or_none(r.get("report_date"))
+
+def _filing_date_d(r: Dict[str, Any]) -> Optional[dt.date]:
+    return r.get("_filing_date_d") or parse_iso_date_or_none(r.get("filing_date"))
 
 def raw_sort_key(r: Dict[str, Any]) -> Tuple[str, dt.date, dt.date, str]:
     t = (r.get("ticker") or "")
-    rep = parse_iso_date_or_none(r.get("report_date")) or dt.date(9999, 12, 31)
-    fil = parse_iso_date_or_none(r.get("filing_date")) or dt.date(9999, 12, 31)
+    rep = _report_date_d(r) or dt.date(9999, 12, 31)
+    fil = _filing_date_d(r) or dt.date(9999, 12, 31)
     acc = r.get("accession") or ""
     return (t, rep, fil, acc)
 
 def panel_sort_key(r: Dict[str, Any]) -> Tuple[str, dt.date]:
     t = (r.get("ticker") or "")
-    rep = parse_iso_date_or_none(r.get("report_date")) or dt.date(9999, 12, 31)
+    rep = _report_date_d(r) or dt.date(9999, 12, 31)
     return (t, rep)
 
 def prompt_mode() -> str:
@@ -436,18 +662,28 @@ def delete_if_exists(path: str) -> None:
     except Exception:
         pass
 
-def _latest_rank(form: str, filing_date: str, accession: str) -> Tuple[int, dt.date, str]:
-    is_amend = 1 if (form or "") == "13F-HR/A" else 0
-    fd = parse_iso_date_or_none(filing_date) or dt.date(1900,1,1)
-    return (is_amend, fd, accession or "")
+def _latest_rank(r: Dict[str, Any]) -> Tuple[int, dt.date, str]:
+    is_amend = 1 if (r.get("form") or "") == "13F-HR/A" else 0
+    fd = _filing_date_d(r) or dt.date(1900,1,1)
+    return (is_amend, fd, r.get("accession") or "")
 
 def dedupe_raw_keep_latest(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     best: Dict[Tuple[str,str,str,str], Dict[str, Any]] = {}
+    best_rank: Dict[Tuple[str,str,str,str], Tuple[int, dt.date, str]] = {}
     for r in rows:
         key = (r.get("filer_cik") or "", r.get("ticker") or "", r.get("report_date") or "", r.get("cusip") or "")
         cur = best.get(key)
-        if cur is None or _latest_rank(r.get("form",""), r.get("filing_date",""), r.get("accession","")) > _latest_rank(cur.get("form",""), cur.get("filing_date",""), cur.get("accession","")):
+        if cur is None:
+            best[key] = r
+            continue
+        # Rank only on collisions (most keys are seen once) and remember the
+        # incumbent's rank so it is computed at most once.
+        cur_rank = best_rank.get(key) or _latest_rank(cur)
+        rk = _latest_rank(r)
+        if rk > cur_rank:
             best[key] = r
+            cur_rank = rk
+        best_rank[key] = cur_rank
     out = list(best.values())
     out.sort(key=raw_sort_key)
     return out
@@ -469,7 +705,7 @@ def panel_build_max_across_filers(group: str, raw_rows: List[Dict[str, Any]]) ->
     for r in collapsed:
         key = (r.get("filer_cik") or "", r.get("report_date") or "", r.get("ticker") or "", r.get("cusip") or "")
         cur = best_version.get(key)
-        if cur is None or _latest_rank(r.get("form",""), r.get("filing_date",""), r.get("accession","")) > _latest_rank(cur.get("form",""), cur.get("filing_date",""), cur.get("accession","")):
+        if cur is None or _latest_rank(r) > _latest_rank(cur):
             best_version[key] = r
     latest = list(best_version.values())
 
@@ -549,11 +785,16 @@ def main() -> None:
     ap.add_argument("--min-report-date", default=DEFAULT_MIN_REPORT_DATE)
     ap.add_argument("--out-dir", default=os.path.expanduser("~"))
     ap.add_argument("--ticker-cusip-csv", default=os.path.join(os.path.expanduser("~"), "ticker_cusip.csv"))
-    ap.add_argument("--sleep", type=float, default=0.25)
+    ap.add_argument("--sleep", type=float, default=0.0,
+                    help="Ignored; requests are paced by a shared rate limiter")
     ap.add_argument("--no-auto-cik", action="store_true")
     ap.add_argument("--auto-cik-max", type=int, default=250)
     ap.add_argument("--mode", choices=["raw", "panel"])
     ap.add_argument("--quiet", action="store_true")
+    ap.add_argument("--cache-dir", default=None,
+                    help="Where to cache submissions/companyfacts/company_tickers JSON (default: <out-dir>/.edgar_cache)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Always re-download submissions/companyfacts/company_tickers JSON")
     args = ap.parse_args()
 
     verbose = not args.quiet
@@ -564,9 +805,10 @@ def main() -> None:
 
     out_dir = os.path.abspath(os.path.expanduser(args.out_dir))
     os.makedirs(out_dir, exist_ok=True)
+    set_json_cache_dir(None if args.no_cache else os.path.abspath(
+        os.path.expanduser(args.cache_dir or os.path.join(out_dir, ".edgar_cache"))))
 
-    session = requests.Session()
-    session.headers.update({"User-Agent": args.user_agent, "Accept-Encoding": "gzip, deflate"})
+    session = build_session(args.user_agent)
 
     start_filing = dt.date.fromisoformat(args.start_date)
     min_report = dt.date.fromisoformat(args.min_report_date)
@@ -584,8 +826,15 @@ def main() -> None:
         cusip_to_tickers.setdefault(c, []).append(t)
     allowed_cusips: Set[str] = set(cusip_to_tickers.keys())
 
-    ticker_to_issuer_cik = build_ticker_to_issuer_cik(session, verbose=verbose)
-    shares_series_cache: Dict[str, List[Tuple[dt.date, int]]] = {}
+    # Loaded once: used both for issuer CIKs here and for auto-expanding
+    # the filer CIK sets below.
+    if verbose:
+        print("Loading SEC company_tickers.json (first download can take ~5-20s)…", flush=True)
+    companies = fetch_company_tickers(session)
+    if verbose:
+        print("Loaded company_tickers.json.", flush=True)
+    ticker_to_issuer_cik = build_ticker_to_issuer_cik(companies)
+    shares_series_cache: Dict[str, SharesSeries] = {}
 
     def get_shares_outstanding_for(ticker: str, report_date_str: str) -> Optional[int]:
         d = parse_iso_date_or_none(report_date_str)
@@ -596,9 +845,9 @@ def main() -> None:
             return None
         if issuer_cik not in shares_series_cache:
             try:
-                shares_series_cache[issuer_cik] = fetch_shares_outstanding_series(session, issuer_cik)
+                shares_series_cache[issuer_cik] = split_shares_series(fetch_shares_outstanding_series(session, issuer_cik))
             except Exception:
-                shares_series_cache[issuer_cik] = []
+                shares_series_cache[issuer_cik] = ([], [])
         return pick_shares_outstanding(shares_series_cache[issuer_cik], d)
 
     with open(os.path.join(out_dir, "13F_OUTPUT_README.txt"), "w", encoding="utf-8") as f:
@@ -614,8 +863,14 @@ def main() -> None:
     else:
         if verbose:
             print("Building candidate CIK sets (auto-expanding)…", flush=True)
-        companies = sec_get(session, SEC_COMPANY_TICKERS).json()
         companies_list = [v for _, v in companies.items()]
+
+        def files_13f(cik_p: str) -> bool:
+            try:
+                return has_any_13f_in_recent(fetch_submissions(session, cik_p))
+            except Exception:
+                return False
+
         for group, cfg in GROUPS.items():
             kws = [k.lower().strip() for k in cfg["keywords"] if k.strip()]
             candidates = [c for c in companies_list if any(kw in (c.get("title") or "").lower() for kw in kws)]
@@ -630,22 +885,22 @@ def main() -> None:
             if verbose:
                 print(f"  {group}: scanning up to {len(candidates)} candidates…", flush=True)
 
-            for i, c in enumerate(candidates, start=1):
+            cand_ciks: List[str] = []
+            for c in candidates:
                 cik = str(c.get("cik_str") or "").strip()
-                if not cik:
-                    continue
-                cik_p = pad_cik(cik)
-                if cik_p in verified:
-                    continue
-                try:
-                    sub = fetch_submissions(session, cik_p)
-                    if has_any_13f_in_recent(sub):
+                cand_ciks.append(pad_cik(cik) if cik else "")
+            to_check = [c for c in dict.fromkeys(cand_ciks) if c and c not in verified]
+            # Futures are read in candidate order while the pool is still
+            # working, so the progress lines track the lookups as they land.
+            with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+                has_13f = {c: pool.submit(files_13f, c) for c in to_check}
+                for i, cik_p in enumerate(cand_ciks, start=1):
+                    if not cik_p or cik_p in verified:
+                        continue
+                    if has_13f[cik_p].result():
                         verified.add(cik_p)
-                except Exception:
-                    pass
-                if verbose and i % 50 == 0:
-                    print(f"    {group}: scanned {i}/{len(candidates)}… (verified={len(verified)})", flush=True)
-                time.sleep(0.02)
+                    if verbose and i % 50 == 0:
+                        print(f"    {group}: scanned {i}/{len(candidates)}… (verified={len(verified)})", flush=True)
             group_ciks[group] = sorted(verified)
             if verbose:
                 print(f"  {group}: using {len(group_ciks[group])} filer CIK(s).", flush=True)
@@ -695,69 +950,93 @@ def main() -> None:
             if len(uniq) == 0:
                 print("No filings found — check CIKs or SEC throttling.", flush=True)
 
-        raw_rows: List[Dict[str, Any]] = []
-        for i, fobj in enumerate(uniq, start=1):
+        # Network + XML parse run in the pool; rows are assembled here, in
+        # filing order, so output and the shares-outstanding cache are
+        # exactly as with a serial loop.
+        def fetch_filing(fobj: Filing) -> Tuple[str, bool, Optional[str], List[Dict[str, Any]], Optional[Exception]]:
             rep_norm = normalize_report_date_str(fobj.report_date) or infer_report_date_from_primary(session, fobj)
             rep_date = parse_iso_date_or_none(rep_norm)
             if rep_date is not None and rep_date < min_report:
-                continue
-
-            if verbose and (i == 1 or i % 25 == 0 or i == len(uniq)):
-                print(f"  Filing {i}/{len(uniq)}: {fobj.form} filed {fobj.filing_date} report {rep_norm} CIK {fobj.cik}", flush=True)
-
+                return rep_norm, True, None, [], None
             try:
                 info_url = find_info_table_url(session, fobj)
                 if not info_url:
-                    time.sleep(args.sleep)
+                    return rep_norm, False, None, [], None
+                # Parse straight off the (gzip-decoded) socket stream so the
+                # whole document is never held in memory at once.
+                resp = sec_get(session, info_url, stream=True)
+                try:
+                    resp.raw.decode_content = True
+                    parsed = parse_info_table_xml(resp.raw, allowed_cusips)
+                finally:
+                    resp.close()
+                return rep_norm, False, info_url, parsed, None
+            except Exception as e:
+                return rep_norm, False, None, [], e
+
+        raw_rows: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            # Consume results in order as they complete so aggregation (and any
+            # companyfacts lookups) overlaps the workers still fetching.
+            for i, (fobj, (rep_norm, skipped, info_url, parsed, err)) in enumerate(zip(uniq, pool.map(fetch_filing, uniq)), start=1):
+                if skipped:
                     continue
-                xml = sec_get(session, info_url).content
-                parsed = parse_info_table_xml(xml)
 
-                so_cache_local: Dict[Tuple[str, str], Optional[int]] = {}
+                if verbose and (i == 1 or i % 25 == 0 or i == len(uniq)):
+                    print(f"  Filing {i}/{len(uniq)}: {fobj.form} filed {fobj.filing_date} report {rep_norm} CIK {fobj.cik}", flush=True)
 
-                for r in parsed:
-                    cusip = (r.get("cusip") or "").strip()
-                    if not cusip or cusip not in allowed_cusips:
-                        continue
-                    for ticker in cusip_to_tickers.get(cusip, []):
-                        so_key = (ticker, rep_norm)
-                        if so_key not in so_cache_local:
-                            so_cache_local[so_key] = get_shares_outstanding_for(ticker, rep_norm) if rep_norm else None
-                        so = so_cache_local[so_key]
-
-                        out_row = {k: "" for k in RAW_COLUMNS}
-                        out_row.update(r)
-                        out_row["group"] = group
-                        out_row["ticker"] = ticker
-                        out_row["mapped_cusip"] = ticker_to_cusip.get(ticker, "")
-                        out_row["filer_cik"] = fobj.cik
-                        out_row["form"] = fobj.form
-                        out_row["filing_date"] = str(fobj.filing_date).strip()
-                        out_row["report_date"] = rep_norm
-                        out_row["accession"] = fobj.accession
-                        out_row["info_table_url"] = info_url
-                        out_row["shares_outstanding"] = str(so) if so is not None else ""
-                        raw_rows.append(out_row)
+                if err is not None:
+                    if verbose:
+                        print(f"    Parse error: {err}", flush=True)
+                    continue
+                if not info_url:
+                    continue
 
-            except Exception as e:
-                if verbose:
-                    print(f"    Parse error: {e}", flush=True)
-
-            time.sleep(args.sleep)
-
-        raw_rows_sorted = sorted(raw_rows, key=raw_sort_key)
-
-        # de-dupe latest filing per filer/ticker/report/cusip
-        best: Dict[Tuple[str,str,str,str], Dict[str, Any]] = {}
-        for r in raw_rows_sorted:
-            key = (r.get("filer_cik") or "", r.get("ticker") or "", r.get("report_date") or "", r.get("cusip") or "")
-            cur = best.get(key)
-            def rank(x):
-                return _latest_rank(x.get("form",""), x.get("filing_date",""), x.get("accession","")) if x else (-1, dt.date(1900,1,1), "")
-            if cur is None or rank(r) > rank(cur):
-                best[key] = r
-        raw_rows_deduped = list(best.values())
-        raw_rows_deduped.sort(key=raw_sort_key)
+                try:
+                    so_cache_local: Dict[Tuple[str, str], Optional[int]] = {}
+                    rep_date = parse_iso_date_or_none(rep_norm)
+                    fil_date_s = fobj.filing_date.strip()
+                    # Fields shared by every row of this filing, built once
+                    # rather than re-read off fobj for each matched holding.
+                    filing_fields = {
+                        "group": group,
+                        "filer_cik": fobj.cik,
+                        "form": fobj.form,
+                        "filing_date": fil_date_s,
+                        "report_date": rep_norm,
+                        "_report_date_d": rep_date,
+                        "_filing_date_d": parse_iso_date_or_none(fil_date_s),
+                        "accession": fobj.accession,
+                        "info_table_url": info_url,
+                    }
+
+                    for r in parsed:
+                        cusip = (r.get("cusip") or "").strip()
+                        if not cusip or cusip not in allowed_cusips:
+                            continue
+                        for ticker in cusip_to_tickers.get(cusip, []):
+                            so_key = (ticker, rep_norm)
+                            if so_key not in so_cache_local:
+                                so_cache_local[so_key] = get_shares_outstanding_for(ticker, rep_norm) if rep_norm else None
+                            so = so_cache_local[so_key]
+
+                            out_row = {k: "" for k in RAW_COLUMNS}
+                            out_row.update(r)
+                            out_row.update(filing_fields)
+                            out_row["ticker"] = ticker
+                            out_row["mapped_cusip"] = ticker_to_cusip.get(ticker, "")
+                            out_row["shares_outstanding"] = str(so) if so is not None else ""
+                            raw_rows.append(out_row)
+
+                except Exception as e:
+                    if verbose:
+                        print(f"    Parse error: {e}", flush=True)
+
+        # de-dupe latest filing per filer/ticker/report/cusip.  No pre-sort:
+        # rows that tie on rank share their raw_sort_key (same accession), so
+        # they are already in the order a stable sort would leave them, and
+        # the survivors get sorted once inside dedupe_raw_keep_latest.
+        raw_rows_deduped = dedupe_raw_keep_latest(raw_rows)
 
         if not want_panel:
             out_path = os.path.join(out_dir, f"{group}_13f_holdings_raw.csv")
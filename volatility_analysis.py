@@ -1,11 +1,20 @@
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")          # charts are only saved to disk; safe in worker processes
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 from pathlib import Path
 
+try:
+    import pyarrow.csv as pacsv  # optional: faster CSV parsing
+except ImportError:
+    pacsv = None
+
 # ──────────────────────────────────────────────
 # CONFIG
 # ──────────────────────────────────────────────
@@ -71,13 +80,27 @@ def find_data_dir() -> Path:
 
 def read_price_file(filepath: Path) -> pd.DataFrame:
     """Read a CSV or tab-delimited price file and return a DataFrame."""
-    # Try comma first, fall back to tab
-    try:
-        df = pd.read_csv(filepath, sep=",")
-        if df.shape[1] < 2:
-            raise ValueError("only one column")
-    except Exception:
-        df = pd.read_csv(filepath, sep="\t")
+    df = None
+    if pacsv is not None:
+        # Pick the delimiter from the header line instead of parsing twice
+        with open(filepath, "rb") as f:
+            header = f.readline()
+        delim = "," if b"," in header else "\t"
+        try:
+            df = pacsv.read_csv(
+                filepath, parse_options=pacsv.ParseOptions(delimiter=delim)
+            ).to_pandas()
+        except Exception:
+            df = None
+
+    if df is None:
+        # Try comma first, fall back to tab
+        try:
+            df = pd.read_csv(filepath, sep=",")
+            if df.shape[1] < 2:
+                raise ValueError("only one column")
+        except Exception:
+            df = pd.read_csv(filepath, sep="\t")
 
     df.columns = [c.strip().lower() for c in df.columns]
     return df
@@ -118,10 +141,19 @@ def load_ticker(ticker: str, filepath: Path) -> pd.DataFrame:
     df["date"] = pd.to_datetime(df[date_col])
     df["close"] = pd.to_numeric(df[close_col], errors="coerce")
     df = df.sort_values("date").reset_index(drop=True)
-    df = df[df["date"] >= START_DATE].copy()
-
-    # Simple daily returns
-    df["ret"] = df["close"].pct_change()
+    # Dates are sorted (NaT last), so the post-START_DATE rows are one
+    # contiguous slice; find its bounds by binary search instead of a mask.
+    dates = df["date"].to_numpy()
+    lo = np.searchsorted(dates, np.datetime64(START_DATE))
+    hi = len(dates) - int(np.isnat(dates).sum())
+    df = df.iloc[lo:hi].copy()
+
+    # Simple daily returns: close[t] / close[t-1] - 1, same as pct_change()
+    close = df["close"].to_numpy(dtype=np.float64)
+    ret = np.full(len(close), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret[1:] = close[1:] / close[:-1] - 1.0
+    df["ret"] = ret
     df = df.dropna(subset=["ret"])
     df["ticker"] = ticker
 
@@ -133,53 +165,64 @@ def load_ticker(ticker: str, filepath: Path) -> pd.DataFrame:
 # ──────────────────────────────────────────────
 def add_rolling_metrics(df: pd.DataFrame) -> pd.DataFrame:
     """Add rolling annualized volatility (%) and rolling returns (%) columns."""
+    ret = df["ret"]
+    close = df["close"].to_numpy(dtype=np.float64)
+
+    # Build all window columns as plain arrays, then add them in one assign
+    # instead of six separate column insertions.
+    new_cols = {}
     for w in ROLLING_WINDOWS:
         # Rolling volatility (annualized, %)
-        vol_col = f"roll_{w}d_vol"
-        df[vol_col] = (
-            df["ret"]
-            .rolling(window=w, min_periods=w)
-            .std()
+        new_cols[f"roll_{w}d_vol"] = (
+            ret.rolling(window=w, min_periods=w).std().to_numpy()
             * np.sqrt(TRADING_DAYS)
             * 100
         )
-        
+
         # Rolling return over window (%, cumulative return over the window)
-        ret_col = f"roll_{w}d_ret"
-        df[ret_col] = (
-            df["close"]
-            .pct_change(periods=w)
-            * 100
-        )
-    return df
+        # Same close[t] / close[t-w] - 1 as pct_change(periods=w), done as
+        # one array slice instead of a shifted Series per window.
+        roll_ret = np.full(len(close), np.nan)
+        roll_ret[w:] = (close[w:] / close[:-w] - 1.0) * 100
+        new_cols[f"roll_{w}d_ret"] = roll_ret
+    return df.assign(**new_cols)
+
+
+def _yearly_ret_std(df: pd.DataFrame) -> pd.DataFrame:
+    """Std dev and count of daily returns per calendar year (years with too few obs dropped)."""
+    # Calendar year straight from the datetime64 buffer (no .dt accessor)
+    years = df["date"].to_numpy().astype("datetime64[Y]").astype(np.int32) + 1970
+    ret = df["ret"].to_numpy(dtype=np.float64)
+    y0 = years.min() if len(years) else 0
+
+    # One bincount per moment instead of a groupby; two passes (mean, then
+    # squared deviations) keep the std as stable as pandas' own.
+    idx = years - y0
+    n = np.bincount(idx)
+    mean = np.bincount(idx, weights=ret) / np.maximum(n, 1)
+    dev = ret - mean[idx]
+    ss = np.bincount(idx, weights=dev * dev)
+
+    keep = n >= MIN_OBS_PER_YEAR
+    return pd.DataFrame({
+        "year": (np.flatnonzero(keep) + y0).astype(years.dtype),
+        "daily_std": np.sqrt(ss[keep] / (n[keep] - 1)),
+        "n_obs": n[keep].astype(np.int64),
+    })
 
 
 def annual_vol(df: pd.DataFrame) -> pd.DataFrame:
     """Annualized volatility per calendar year (%)."""
-    df = df.copy()
-    df["year"] = df["date"].dt.year
-    agg = (
-        df.groupby("year")["ret"]
-        .agg(["std", "count"])
-        .rename(columns={"std": "daily_std", "count": "n_obs"})
-    )
-    agg = agg[agg["n_obs"] >= MIN_OBS_PER_YEAR]
+    agg = _yearly_ret_std(df)
     agg["annual_vol_pct"] = agg["daily_std"] * np.sqrt(TRADING_DAYS) * 100
-    return agg.reset_index()
+    return agg
 
 
 def daily_vol_by_year(df: pd.DataFrame) -> pd.DataFrame:
     """Average daily volatility (std dev of daily returns, NOT annualized) per year (%)."""
-    df = df.copy()
-    df["year"] = df["date"].dt.year
-    agg = (
-        df.groupby("year")["ret"]
-        .agg(["std", "count"])
-        .rename(columns={"std": "daily_std", "count": "n_obs"})
-    )
-    agg = agg[agg["n_obs"] >= MIN_OBS_PER_YEAR]
+    agg = _yearly_ret_std(df)
     agg["daily_vol_pct"] = agg["daily_std"] * 100
-    return agg.reset_index()
+    return agg
 
 
 # ──────────────────────────────────────────────
@@ -257,7 +300,8 @@ def plot_rolling_vol_with_return(df: pd.DataFrame, ticker: str, window: int, fol
     ax1.grid(True, alpha=0.3)
     ax2.grid(False)
     
-    fig.tight_layout()
+    # No explicit fig.tight_layout(): "figure.autolayout" already runs it
+    # when the figure is drawn, as for every other chart here.
     _save(fig, folder, f"{ticker}_rolling_{window}d_vol_return")
 
 
@@ -315,6 +359,35 @@ def plot_daily_vol_bars(dv: pd.DataFrame, ticker: str, folder: Path):
     _save(fig, folder, f"{ticker}_daily_vol_by_year")
 
 
+# ──────────────────────────────────────────────
+# PER-TICKER PIPELINE
+# ──────────────────────────────────────────────
+def process_ticker(ticker: str, fname: str, data_dir: Path, output_root: Path) -> int:
+    """Load, compute and chart one ticker; return its number of observations."""
+    fpath = data_dir / fname
+
+    # Load & compute
+    df = load_ticker(ticker, fpath)
+    df = add_rolling_metrics(df)
+    av = annual_vol(df)
+    dv = daily_vol_by_year(df)
+
+    # Create ticker subfolder
+    ticker_dir = output_root / ticker
+    ticker_dir.mkdir(exist_ok=True)
+
+    # Generate all charts
+    plot_cumulative_returns(df, ticker, ticker_dir)
+
+    for w in ROLLING_WINDOWS:
+        plot_rolling_vol_with_return(df, ticker, w, ticker_dir)
+
+    plot_annual_vol_bars(av, ticker, ticker_dir)
+    plot_daily_vol_bars(dv, ticker, ticker_dir)
+
+    return len(df)
+
+
 # ──────────────────────────────────────────────
 # MAIN
 # ──────────────────────────────────────────────
@@ -338,34 +411,18 @@ def main():
         print("\nPut all data files in the same folder as this script.")
         sys.exit(1)
 
-    # Process each ticker
-    for ticker in sorted(FILE_MAP.keys()):
-        fname = FILE_MAP[ticker]
-        fpath = data_dir / fname
-
-        print(f"Processing {ticker} ...", end=" ", flush=True)
-
-        # Load & compute
-        df = load_ticker(ticker, fpath)
-        df = add_rolling_metrics(df)
-        av = annual_vol(df)
-        dv = daily_vol_by_year(df)
-
-        # Create ticker subfolder
-        ticker_dir = output_root / ticker
-        ticker_dir.mkdir(exist_ok=True)
-
-        # Generate all charts
-        plot_cumulative_returns(df, ticker, ticker_dir)
-
-        for w in ROLLING_WINDOWS:
-            plot_rolling_vol_with_return(df, ticker, w, ticker_dir)
-
-        plot_annual_vol_bars(av, ticker, ticker_dir)
-        plot_daily_vol_bars(dv, ticker, ticker_dir)
-
-        n_charts = 2 + len(ROLLING_WINDOWS)  # returns + rolling + 2 bar charts
-        print(f"✓  ({len(df)} obs, {n_charts + 1} charts saved to output/{ticker}/)")
+    # Process each ticker — tickers are independent, so run them in
+    # separate processes (chart rendering dominates the run time)
+    tickers = sorted(FILE_MAP.keys())
+    fnames = [FILE_MAP[t] for t in tickers]
+    workers = min(len(tickers), os.cpu_count() or 1)
+    n_charts = 2 + len(ROLLING_WINDOWS)  # returns + rolling + 2 bar charts
+
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        mapper = ex.map if workers > 1 else map
+        results = mapper(process_ticker, tickers, fnames, repeat(data_dir), repeat(output_root))
+        for ticker, n_obs in zip(tickers, results):
+            print(f"Processing {ticker} ... ✓  ({n_obs} obs, {n_charts + 1} charts saved to output/{ticker}/)")
 
     print(f"\nDone. All charts saved under: {output_root}")
 